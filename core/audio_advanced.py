@@ -6,21 +6,34 @@ Advanced audio processing features
 - Pronunciation dictionary
 - Audio normalization
 """
+import functools
 import logging
+import math
 import numpy as np
 import soundfile as sf
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import re
 
+from .audio_combine import map_wav_float32
+
 logger = logging.getLogger(__name__)
 
+# Optional: numba compiles the silence scan into a single pass over the audio
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class PronunciationDictionary:
     """Manages pronunciation overrides for specific words"""
 
     def __init__(self):
         self.dictionary: Dict[str, str] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._lookup: Dict[str, str] = {}
         self.load_defaults()
 
     def load_defaults(self):
@@ -43,16 +56,23 @@ class PronunciationDictionary:
             'Porsche': 'Por-shuh',
             'Nike': 'Ny-kee',
         })
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the compiled pattern so it is rebuilt on next use"""
+        self._pattern = None
 
     def add(self, word: str, pronunciation: str):
         """Add or update pronunciation"""
         self.dictionary[word] = pronunciation
+        self._invalidate()
         logger.debug(f"Added pronunciation: {word} -> {pronunciation}")
 
     def remove(self, word: str):
         """Remove pronunciation override"""
         if word in self.dictionary:
             del self.dictionary[word]
+            self._invalidate()
             logger.debug(f"Removed pronunciation: {word}")
 
     def apply_to_text(self, text: str) -> str:
@@ -61,13 +81,26 @@ class PronunciationDictionary:
 
         Replaces words with their pronunciation hints
         """
-        result = text
-        for word, pronunciation in self.dictionary.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(word) + r'\b'
-            result = re.sub(pattern, pronunciation, result, flags=re.IGNORECASE)
-
-        return result
+        if not self.dictionary:
+            return text
+
+        if self._pattern is None:
+            self._compile()
+
+        # IGNORECASE also matches case variants that lower() does not map back to
+        # the dictionary word (e.g. 'ſ' for 's'), so unknown keys keep the match
+        return self._pattern.sub(lambda m: self._lookup.get(m.group(0).casefold(), m.group(0)), text)
+
+    def _compile(self):
+        """Build a single case-insensitive alternation over all dictionary words"""
+        # Longest words first so multi-word entries win over their prefixes
+        words = sorted(self.dictionary, key=len, reverse=True)
+        # Use word boundaries to avoid partial matches
+        self._pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b',
+            re.IGNORECASE,
+        )
+        self._lookup = {word.casefold(): pronunciation for word, pronunciation in self.dictionary.items()}
 
     def load_from_file(self, filepath: str):
         """Load dictionary from CSV file (word,pronunciation)"""
@@ -109,14 +142,30 @@ def adjust_speech_rate(audio: np.ndarray, sample_rate: int, rate: float) -> np.n
     Returns:
         Time-stretched audio
     """
+    # Treat rates within rounding error of 1.0 as a no-op instead of running
+    # a full STFT/phase-vocoder round trip that only adds artifacts
+    if abs(rate - 1.0) < 1e-3:
+        return audio
+
+    # Prefer Rubber Band (higher quality on speech) when available
     try:
-        import librosa
+        import pyrubberband as pyrb
+
+        stretched = pyrb.time_stretch(audio, sample_rate, rate)
+        logger.debug(f"Adjusted speech rate by {rate}x (rubberband): {len(audio)} -> {len(stretched)} samples")
+        return stretched
+
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning(f"Rubber Band time stretch failed, falling back to librosa: {e}")
 
-        if rate == 1.0:
-            return audio
+    try:
+        import librosa
 
-        # Use librosa's time stretch
-        stretched = librosa.effects.time_stretch(audio, rate=rate)
+        # Use librosa's time stretch with a ~40 ms window, which suits speech
+        # better than the default 2048-sample frame
+        stretched = librosa.effects.time_stretch(audio, rate=rate, n_fft=int(sample_rate * 0.04))
         logger.debug(f"Adjusted speech rate by {rate}x: {len(audio)} -> {len(stretched)} samples")
         return stretched
 
@@ -128,6 +177,96 @@ def adjust_speech_rate(audio: np.ndarray, sample_rate: int, rate: float) -> np.n
         return audio
 
 
+def _silence_runs(is_silence: np.ndarray, min_samples: int) -> np.ndarray:
+    """Return an (N, 2) array of [start, end) runs of True at least min_samples long"""
+    # Find contiguous silence regions from the edges of the mask: padding with
+    # False on both sides makes every run produce exactly one (start, end) pair
+    padded = np.concatenate(([False], is_silence, [False]))
+    edges = np.flatnonzero(np.diff(padded.view(np.int8)))
+    runs = edges.reshape(-1, 2)
+    return runs[runs[:, 1] - runs[:, 0] >= min_samples]
+
+
+def _silence_regions_kernel(audio, threshold, min_samples):
+    """Scan audio once, returning an (N, 2) array of silent [start, end) runs"""
+    regions = np.empty((1024, 2), np.int64)
+    count = 0
+    start = -1
+    n = audio.shape[0]
+    for i in range(n + 1):
+        if i < n and abs(audio[i]) < threshold:
+            if start < 0:
+                start = i
+        elif start >= 0:
+            if i - start >= min_samples:
+                if count == regions.shape[0]:
+                    grown = np.empty((count * 2, 2), np.int64)
+                    grown[:count] = regions
+                    regions = grown
+                regions[count, 0] = start
+                regions[count, 1] = i
+                count += 1
+            start = -1
+    return regions[:count]
+
+
+if NUMBA_AVAILABLE:
+    _silence_regions_nb = njit(cache=True)(_silence_regions_kernel)
+
+
+def _silence_mask(audio: np.ndarray, threshold_linear: float) -> np.ndarray:
+    """Boolean mask of samples whose magnitude is below the linear threshold"""
+    if audio.dtype == np.int16:
+        # PCM samples are compared in integer units relative to full scale.
+        # Viewing the magnitude as uint16 maps abs(-32768), which wraps to
+        # -32768, onto 32768 so the full-scale negative sample stays loud.
+        threshold_int = math.ceil(threshold_linear * 32768)
+        return np.abs(audio).view(np.uint16) < threshold_int
+
+    # -t < x < t is the same test as |x| < t, but only writes boolean
+    # buffers instead of a full-width magnitude array
+    is_silence = np.less(audio, threshold_linear)
+    above = np.greater(audio, -threshold_linear)
+    np.logical_and(is_silence, above, out=is_silence)
+    return is_silence
+
+
+def _frame_silence_mask(audio: np.ndarray, threshold_linear: float) -> np.ndarray:
+    """Per-frame silence mask; a multi-channel frame is silent only if every channel is"""
+    is_silence = _silence_mask(audio, threshold_linear)
+    if is_silence.ndim > 1:
+        is_silence = is_silence.all(axis=tuple(range(1, is_silence.ndim)))
+    return is_silence
+
+
+def _leading_silence_end(audio: np.ndarray, threshold_linear: float) -> int:
+    """Index of the first non-silent sample, or len(audio) if all of it is silent"""
+    # Scan in growing blocks so typical short lead-ins touch only a few KB
+    start = 0
+    block = 4096
+    while start < len(audio):
+        is_silence = _frame_silence_mask(audio[start:start + block], threshold_linear)
+        if not is_silence.all():
+            return start + int(np.argmin(is_silence))
+        start += block
+        block = min(block * 2, 1 << 20)
+    return len(audio)
+
+
+def _trailing_silence_start(audio: np.ndarray, threshold_linear: float) -> int:
+    """Index just past the last non-silent sample, or 0 if all of it is silent"""
+    end = len(audio)
+    block = 4096
+    while end > 0:
+        begin = max(0, end - block)
+        is_silence = _frame_silence_mask(audio[begin:end], threshold_linear)
+        if not is_silence.all():
+            return end - int(np.argmin(is_silence[::-1]))
+        end = begin
+        block = min(block * 2, 1 << 20)
+    return 0
+
+
 def detect_silence(audio: np.ndarray, sample_rate: int,
                    threshold_db: float = -40.0,
                    min_silence_duration: float = 0.1) -> List[Tuple[int, int]]:
@@ -143,37 +282,20 @@ def detect_silence(audio: np.ndarray, sample_rate: int,
     Returns:
         List of (start_sample, end_sample) tuples for silence regions
     """
-    # Convert to dB
-    audio_abs = np.abs(audio)
-    audio_db = 20 * np.log10(audio_abs + 1e-10)  # Add epsilon to avoid log(0)
-
-    # Find samples below threshold
-    is_silence = audio_db < threshold_db
-
-    # Find contiguous silence regions
-    silence_regions = []
-    in_silence = False
-    silence_start = 0
+    # Compare magnitudes against the threshold converted to linear amplitude
+    # (equivalent to comparing in dB, without a log10 over every sample)
+    threshold_linear = 10.0 ** (threshold_db / 20.0)
 
     min_samples = int(min_silence_duration * sample_rate)
 
-    for i, silent in enumerate(is_silence):
-        if silent and not in_silence:
-            # Start of silence
-            in_silence = True
-            silence_start = i
-        elif not silent and in_silence:
-            # End of silence
-            in_silence = False
-            silence_length = i - silence_start
-            if silence_length >= min_samples:
-                silence_regions.append((silence_start, i))
-
-    # Handle silence at end
-    if in_silence:
-        silence_length = len(audio) - silence_start
-        if silence_length >= min_samples:
-            silence_regions.append((silence_start, len(audio)))
+    # Find samples below threshold
+    if NUMBA_AVAILABLE and audio.ndim == 1 and audio.dtype.kind == 'f':
+        # Compiled scan: no mask array and no second pass to find the edges
+        runs = _silence_regions_nb(np.ascontiguousarray(audio), threshold_linear, min_samples)
+    else:
+        runs = _silence_runs(_silence_mask(audio, threshold_linear), min_samples)
+
+    silence_regions = [(int(start), int(end)) for start, end in runs]
 
     logger.debug(f"Detected {len(silence_regions)} silence regions")
     return silence_regions
@@ -198,23 +320,30 @@ def trim_silence(audio: np.ndarray, sample_rate: int,
     Returns:
         Trimmed audio
     """
-    # Find silence regions
-    silence_regions = detect_silence(audio, sample_rate, threshold_db, min_silence_duration=0.05)
-
-    if not silence_regions:
-        return audio
+    # Only the silence touching each edge matters, so scan inwards from the
+    # edges and stop at the first sound instead of analysing the whole clip
+    threshold_linear = 10.0 ** (threshold_db / 20.0)
+    # Edge silence shorter than this is left alone
+    min_samples = max(int(0.05 * sample_rate), 1)
 
     pad_samples = int(pad_seconds * sample_rate)
     start_trim = 0
     end_trim = len(audio)
 
     # Trim start
-    if trim_start and silence_regions and silence_regions[0][0] == 0:
-        start_trim = max(0, silence_regions[0][1] - pad_samples)
+    if trim_start:
+        leading_end = _leading_silence_end(audio, threshold_linear)
+        if leading_end >= min_samples:
+            start_trim = max(0, leading_end - pad_samples)
 
     # Trim end
-    if trim_end and silence_regions and silence_regions[-1][1] == len(audio):
-        end_trim = min(len(audio), silence_regions[-1][0] + pad_samples)
+    if trim_end:
+        trailing_start = _trailing_silence_start(audio, threshold_linear)
+        if len(audio) - trailing_start >= min_samples:
+            end_trim = min(len(audio), trailing_start + pad_samples)
+
+    if start_trim == 0 and end_trim == len(audio):
+        return audio
 
     trimmed = audio[start_trim:end_trim]
     logger.debug(f"Trimmed audio: {len(audio)} -> {len(trimmed)} samples")
@@ -247,47 +376,67 @@ def normalize_audio(audio: np.ndarray, target_db: float = -3.0) -> np.ndarray:
     gain_linear = 10 ** (gain_db / 20)
 
     # Apply gain
-    normalized = audio * gain_linear
+    normalized = np.multiply(audio, gain_linear)
 
-    # Clip to prevent overflow
-    normalized = np.clip(normalized, -1.0, 1.0)
+    # Peak normalization puts the loudest sample exactly at the target, so
+    # clipping is only needed when the target itself is above full scale
+    if target_db > 0:
+        np.clip(normalized, -1.0, 1.0, out=normalized)
 
     logger.debug(f"Normalized audio: {current_db:.1f} dB -> {target_db:.1f} dB (gain: {gain_db:.1f} dB)")
     return normalized
 
 
+@functools.lru_cache(maxsize=16)
+def _fade_curve(samples: int, direction: str) -> np.ndarray:
+    """Linear fade curve of the given length ('in' rises 0->1, 'out' falls 1->0)"""
+    curve = np.linspace(0, 1, samples) if direction == 'in' else np.linspace(1, 0, samples)
+    curve.flags.writeable = False  # Shared between calls via the cache
+    return curve
+
+
 def apply_fade(audio: np.ndarray, sample_rate: int,
                fade_in_duration: float = 0.0,
-               fade_out_duration: float = 0.0) -> np.ndarray:
+               fade_out_duration: float = 0.0,
+               in_place: bool = False) -> np.ndarray:
     """
     Apply fade in/out to audio
 
     Args:
-        audio: Audio data
+        audio: Audio data, mono (samples,) or multichannel (samples, channels)
         sample_rate: Sample rate in Hz
         fade_in_duration: Fade in duration in seconds
         fade_out_duration: Fade out duration in seconds
+        in_place: Modify audio directly instead of returning a faded copy
 
     Returns:
         Audio with fades applied
     """
-    result = audio.copy()
+    # Copies are made row-contiguous so the multiplies below stream through memory
+    result = audio if in_place else np.array(audio, order='C')
+
+    def _curve(samples: int, direction: str) -> np.ndarray:
+        curve = _fade_curve(samples, direction)
+        # One gain per frame, broadcast across channels
+        return curve[:, None] if result.ndim == 2 else curve
 
     # Fade in
     if fade_in_duration > 0:
         fade_in_samples = int(fade_in_duration * sample_rate)
         fade_in_samples = min(fade_in_samples, len(audio) // 2)  # Don't exceed half the audio length
 
-        fade_in_curve = np.linspace(0, 1, fade_in_samples)
-        result[:fade_in_samples] *= fade_in_curve
+        if fade_in_samples > 0:
+            head = result[:fade_in_samples]
+            np.multiply(head, _curve(fade_in_samples, 'in'), out=head)
 
     # Fade out
     if fade_out_duration > 0:
         fade_out_samples = int(fade_out_duration * sample_rate)
         fade_out_samples = min(fade_out_samples, len(audio) // 2)
 
-        fade_out_curve = np.linspace(1, 0, fade_out_samples)
-        result[-fade_out_samples:] *= fade_out_curve
+        if fade_out_samples > 0:
+            tail = result[-fade_out_samples:]
+            np.multiply(tail, _curve(fade_out_samples, 'out'), out=tail)
 
     return result
 
@@ -332,10 +481,36 @@ def auto_retry_on_failure(synthesis_function, text: str, max_attempts: int = 3,
     return None
 
 
+def _audio_stats(audio: np.ndarray,
+                 threshold_linear: float) -> Tuple[float, float, np.ndarray]:
+    """
+    Compute sum of squares, peak and silent runs for a block of audio
+
+    The magnitude array is computed once and shared by the peak and silence
+    checks; the sum of squares is a single dot product, so the audio is never
+    squared into a temporary. Runs are returned unfiltered so callers can
+    join them across block boundaries before applying a minimum length.
+    """
+    flat = audio.ravel()
+    sum_sq = float(np.dot(flat, flat))
+
+    magnitude = np.abs(audio)
+    peak = float(magnitude.max()) if magnitude.size else 0.0
+
+    # A frame is silent when every channel is below the threshold
+    frame_magnitude = magnitude if magnitude.ndim == 1 else magnitude.max(axis=1)
+    runs = _silence_runs(frame_magnitude < threshold_linear, 0)
+
+    return sum_sq, peak, runs
+
+
 def analyze_audio_quality(audio_path: str) -> Dict[str, any]:
     """
     Analyze audio quality metrics
 
+    The file is streamed in fixed-size blocks, so memory use does not grow
+    with the length of the audio.
+
     Returns dict with:
         - rms: Root mean square
         - peak: Peak amplitude
@@ -344,20 +519,56 @@ def analyze_audio_quality(audio_path: str) -> Dict[str, any]:
         - clipping: Whether audio is clipped
     """
     try:
-        audio, sr = sf.read(audio_path)
+        info = sf.info(audio_path)
+        sr = info.samplerate
+        total = info.frames
+
+        threshold_linear = 10.0 ** (-40.0 / 20.0)
+        min_samples = int(0.1 * sr)
+
+        sum_sq = 0.0
+        peak = 0.0
+        silence_samples = 0
+        # Length of the silent run still open at the end of the previous block
+        carry = 0
+
+        # Float WAVs are memory-mapped and sliced in place; other formats are decoded
+        mapped = map_wav_float32(audio_path)
+        if mapped is not None:
+            blocks = (mapped[i:i + 65536] for i in range(0, total, 65536))
+        else:
+            blocks = sf.blocks(audio_path, blocksize=65536, dtype='float32')
+
+        for block in blocks:
+            block_sum_sq, block_peak, runs = _audio_stats(block, threshold_linear)
+            sum_sq += block_sum_sq
+            peak = max(peak, block_peak)
+
+            lengths = runs[:, 1] - runs[:, 0]
+            if carry:
+                if len(runs) and runs[0, 0] == 0:
+                    # The open run continues into this block
+                    lengths[0] += carry
+                elif carry >= min_samples:
+                    silence_samples += carry
+            carry = 0
+
+            if len(runs) and runs[-1, 1] == len(block):
+                # Last run touches the block end; it may continue in the next one
+                carry = int(lengths[-1])
+                lengths = lengths[:-1]
+
+            silence_samples += int(lengths[lengths >= min_samples].sum())
+
+        if carry >= min_samples:
+            silence_samples += carry
 
         # Calculate metrics
-        rms = np.sqrt(np.mean(audio ** 2))
-        peak = np.max(np.abs(audio))
-        duration = len(audio) / sr
-
-        # Detect silence
-        silence_regions = detect_silence(audio, sr, threshold_db=-40.0)
-        silence_samples = sum(end - start for start, end in silence_regions)
-        silence_ratio = silence_samples / len(audio) if len(audio) > 0 else 0
-
-        # Detect clipping
-        clipping = np.any(np.abs(audio) > 0.99)
+        samples = total * info.channels
+        rms = np.sqrt(sum_sq / samples) if samples else 0.0
+        duration = total / sr
+        silence_ratio = silence_samples / total if total > 0 else 0
+        clipping = peak > 0.99
 
         metrics = {
             'rms': float(rms),
@@ -366,7 +577,7 @@ def analyze_audio_quality(audio_path: str) -> Dict[str, any]:
             'silence_ratio': float(silence_ratio),
             'clipping': bool(clipping),
             'sample_rate': sr,
-            'channels': 1 if audio.ndim == 1 else audio.shape[1],
+            'channels': info.channels,
         }
 
         logger.debug(f"Audio quality: RMS={rms:.4f}, Peak={peak:.4f}, Duration={duration:.1f}s, Silence={silence_ratio:.1%}")
@@ -3,52 +3,224 @@ import numpy as np
 import soundfile as sf
 from pathlib import Path
 import logging
+import mmap
+import os
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Number of input files decoded ahead of the writer in concat_wavs
+_PREFETCH_FILES = 4
+
+
+def _wav_data_span(path):
+    """Return (offset, size) of the data chunk of a little-endian RIFF/WAVE file, or None"""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"data":
+                return f.tell(), chunk_size
+            # Chunks are word aligned
+            f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+def map_wav_float32(path, always_2d=False):
+    """
+    Memory-map a 32-bit float WAV file as a read-only float32 array
+
+    Float WAVs (what the pipeline writes) already have the in-memory layout
+    of a float32 array, so they can be used without decoding or copying.
+
+    Returns:
+        The mapped array, or None if the file is not a mappable float WAV
+    """
+    info = sf.info(path)
+    if info.format != "WAV" or info.subtype != "FLOAT" or info.frames == 0:
+        return None
+    span = _wav_data_span(path)
+    if span is None or span[1] < info.frames * info.channels * 4:
+        return None
+    shape = (info.frames, info.channels)
+    if info.channels == 1 and not always_2d:
+        shape = (info.frames,)
+    return np.memmap(path, dtype="<f4", mode="r", offset=span[0], shape=shape)
+
+
+def read_wav_float32(path, always_2d=False):
+    """
+    Read a WAV file as float32, memory-mapping it when possible
+
+    Returns:
+        (audio, sample_rate)
+    """
+    audio = map_wav_float32(path, always_2d=always_2d)
+    if audio is None:
+        return sf.read(path, dtype="float32", always_2d=always_2d)
+    return audio, sf.info(path).samplerate
+
+
+def _pcm16_wav_header(sr, channels, data_size):
+    """Return the canonical 44-byte header of a 16-bit PCM WAV file"""
+    block_align = channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sr, sr * block_align, block_align, 16,
+        b"data", data_size,
+    )
+
+
+def _copy_range(src, dst, offset, count):
+    """Copy count bytes from offset in src to the current position of dst"""
+    start = offset
+    if hasattr(os, "sendfile"):
+        # Kernel-side copy, the bytes never pass through Python
+        while count > 0:
+            try:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+            except OSError:
+                # macOS/BSD sendfile only writes to sockets (ENOTSOCK); fall
+                # back below, unless part of the range already went out
+                if offset != start:
+                    raise
+                break
+            if sent == 0:
+                raise IOError(f"Unexpected end of file: {src.name}")
+            offset += sent
+            count -= sent
+        else:
+            return
+    if count == 0:
+        return
+    # No usable sendfile (Windows, or macOS/BSD file-to-file): write straight out
+    # of a read-only mapping, so the data is never copied into Python objects
+    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if offset + count > len(mapped):
+            raise IOError(f"Unexpected end of file: {src.name}")
+        with memoryview(mapped) as view:
+            part = view[offset:offset + count]
+            try:
+                while part:
+                    written = dst.write(part)
+                    part = part[written:]
+            finally:
+                part.release()
+
+
+def _concat_pcm16_data(wav_paths, spans, out_path, sr, channels, gap_samples):
+    """
+    Concatenate 16-bit PCM WAVs by copying their data chunks byte for byte
+
+    concat_wavs writes 16-bit PCM output, so when every input already is
+    16-bit PCM at the target rate and channel count, decoding and re-encoding
+    would reproduce exactly these bytes.
+
+    Returns:
+        Total number of frames written
+    """
+    gap_bytes = bytes(gap_samples * channels * 2)
+    data_size = sum(size for _, size in spans) + len(gap_bytes) * (len(wav_paths) - 1)
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    # Unbuffered, so header and gap writes land before the sendfile copies
+    with open(out_path, "wb", buffering=0) as out_file:
+        out_file.write(_pcm16_wav_header(sr, channels, data_size))
+        for i, (p, (offset, size)) in enumerate(zip(wav_paths, spans)):
+            with open(p, "rb") as src:
+                _copy_range(src, out_file, offset, size)
+            if i < len(wav_paths) - 1 and gap_bytes:
+                out_file.write(gap_bytes)
+
+    return data_size // (channels * 2)
+
+
 def concat_wavs(wav_paths, out_path, sr=24000, channels=None, gap_seconds=0.25):
     if not wav_paths:
         raise ValueError("No WAVs provided.")
 
-    pieces, target_channels = [], channels
+    target_channels = channels
     logger.info(f"Concatenating {len(wav_paths)} audio files with {gap_seconds}s gaps")
 
-    for i, p in enumerate(wav_paths):
-        audio, file_sr = sf.read(p, dtype="float32", always_2d=True)
-
-        # Calculate RMS for diagnostics
-        rms = float(np.sqrt(np.mean(np.square(audio))))
-        duration = len(audio) / file_sr
-        logger.info(f"Chunk {i}: shape={audio.shape}, duration={duration:.2f}s, RMS={rms:.6f}, path={p}")
-
-        if file_sr != sr:
-            raise ValueError(f"SR mismatch: {p} has {file_sr}, expected {sr}.")
-
-        if target_channels is None:
-            target_channels = audio.shape[1]
-            logger.debug(f"Target channels set to {target_channels} from first file")
-
-        if audio.shape[1] != target_channels:
-            if audio.shape[1] == 1 and target_channels == 2:
-                audio = np.repeat(audio, 2, axis=1)
-            elif audio.shape[1] == 2 and target_channels == 1:
-                audio = audio.mean(axis=1, keepdims=True)
-            else:
-                raise ValueError("Channel mismatch.")
-
-        pieces.append(audio)
-
-        if i < len(wav_paths) - 1 and gap_seconds > 0:
-            gap_samples = int(sr * gap_seconds)
-            gap = np.zeros((gap_samples, target_channels), dtype="float32")
-            logger.debug(f"Adding gap: {gap.shape} ({gap_seconds}s)")
-            pieces.append(gap)
-
-    combined = np.vstack(pieces)
-    combined_rms = float(np.sqrt(np.mean(np.square(combined))))
-    combined_duration = len(combined) / sr
-    logger.info(f"Combined audio: shape={combined.shape}, duration={combined_duration:.2f}s, RMS={combined_rms:.6f}")
+    # First pass: read headers only, so mismatches fail before any output is written
+    infos = [sf.info(p) for p in wav_paths]
+    for p, info in zip(wav_paths, infos):
+        if info.samplerate != sr:
+            raise ValueError(f"SR mismatch: {p} has {info.samplerate}, expected {sr}.")
+
+    if target_channels is None:
+        target_channels = infos[0].channels
+        logger.debug(f"Target channels set to {target_channels} from first file")
+
+    gap_samples = int(sr * gap_seconds) if gap_seconds > 0 else 0
+
+    # Fast path: same-format 16-bit PCM inputs (what the TTS writes) are
+    # copied without decoding
+    if all(info.format == "WAV" and info.subtype == "PCM_16" and info.channels == target_channels
+           for info in infos):
+        spans = [_wav_data_span(p) for p in wav_paths]
+        if all(span is not None for span in spans):
+            total_frames = _concat_pcm16_data(wav_paths, spans, out_path, sr, target_channels, gap_samples)
+            logger.info(f"Combined audio: {len(wav_paths)} files copied without decoding, "
+                        f"duration={total_frames / sr:.2f}s")
+            return out_path
+
+    gap = np.zeros((gap_samples, target_channels), dtype="float32")
+    total_frames = 0
+    sum_sq = 0.0
+
+    # Second pass: a small thread pool decodes the next few files (libsndfile
+    # releases the GIL) while the current one is written to the output file.
+    # The read-ahead window is bounded so memory stays at a few chunks.
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    sf.write(out_path, combined, sr)
+    with ThreadPoolExecutor(max_workers=_PREFETCH_FILES) as executor, \
+            sf.SoundFile(out_path, "w", samplerate=sr, channels=target_channels) as out_file:
+        pending = deque(
+            executor.submit(read_wav_float32, p, always_2d=True)
+            for p in wav_paths[:_PREFETCH_FILES]
+        )
+
+        for i, (p, info) in enumerate(zip(wav_paths, infos)):
+            audio, _ = pending.popleft().result()
+            next_index = i + _PREFETCH_FILES
+            if next_index < len(wav_paths):
+                pending.append(executor.submit(read_wav_float32, wav_paths[next_index], always_2d=True))
+
+            if audio.shape[1] != target_channels:
+                if audio.shape[1] == 1 and target_channels == 2:
+                    audio = np.repeat(audio, 2, axis=1)
+                elif audio.shape[1] == 2 and target_channels == 1:
+                    audio = audio.mean(axis=1, keepdims=True)
+                else:
+                    raise ValueError("Channel mismatch.")
+
+            # One BLAS pass; the combined RMS is derived from these per-file sums
+            flat = audio.ravel()
+            file_sum_sq = float(np.dot(flat, flat))
+            out_file.write(audio)
+
+            # Calculate RMS for diagnostics
+            rms = np.sqrt(file_sum_sq / audio.size) if audio.size else 0.0
+            duration = len(audio) / info.samplerate
+            logger.info(f"Chunk {i}: shape={audio.shape}, duration={duration:.2f}s, RMS={rms:.6f}, path={p}")
+            total_frames += len(audio)
+            sum_sq += file_sum_sq
+
+            if i < len(wav_paths) - 1 and gap_samples > 0:
+                logger.debug(f"Adding gap: {gap.shape} ({gap_seconds}s)")
+                out_file.write(gap)
+                total_frames += gap_samples
+
+    combined_samples = total_frames * target_channels
+    combined_rms = np.sqrt(sum_sq / combined_samples) if combined_samples else 0.0
+    combined_duration = total_frames / sr
+    logger.info(f"Combined audio: shape={(total_frames, target_channels)}, duration={combined_duration:.2f}s, RMS={combined_rms:.6f}")
 
     return out_path
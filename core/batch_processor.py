@@ -5,9 +5,12 @@ Batch processing for multiple EPUB files
 import logging
 import queue
 import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -39,9 +42,22 @@ class BatchItem:
     start_time: Optional[float] = None
     end_time: Optional[float] = None
 
+    # Derived from epub_path once, since the UI asks for them on every refresh
+    _display_name: str = field(init=False, repr=False, compare=False)
+    _base_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        path = Path(self.epub_path)
+        self._display_name = path.stem
+        self._base_name = path.name
+
     def get_display_name(self) -> str:
         """Get display name for this item"""
-        return Path(self.epub_path).stem
+        return self._display_name
+
+    def get_file_name(self) -> str:
+        """Get the EPUB file name for this item"""
+        return self._base_name
 
     def get_duration_string(self) -> str:
         """Get processing duration as string"""
@@ -66,7 +82,9 @@ class BatchProcessor:
         Args:
             process_function: Function to process a single EPUB
                               Should accept (item: BatchItem, settings: Dict) -> Dict
-            default_settings: Default settings for all items
+            default_settings: Default settings for all items.
+                              'batch_parallelism' sets how many items are
+                              processed at once (default: 1)
         """
         self.process_function = process_function
         self.default_settings = default_settings
@@ -76,8 +94,14 @@ class BatchProcessor:
         self.is_paused = False
         self.stop_flag = threading.Event()
         self.pause_flag = threading.Event()
+        # Set while the worker may run; cleared on pause so the worker blocks on it
+        self.resume_flag = threading.Event()
+        self.resume_flag.set()
         self.worker_thread: Optional[threading.Thread] = None
         self.callbacks: List[Callable] = []
+        # Number of items in each status, kept in step with status changes
+        self._counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
 
     def add_item(self, epub_path: str, cover_path: Optional[str] = None,
                  output_folder: Optional[str] = None, custom_voice: Optional[str] = None,
@@ -98,6 +122,7 @@ class BatchProcessor:
             custom_settings=custom_settings
         )
         self.items.append(item)
+        self._counts[item.status] += 1
         logger.info(f"Added batch item {index}: {item.get_display_name()}")
         self._notify_callbacks({'event': 'item_added', 'item': item})
         return index
@@ -111,9 +136,10 @@ class BatchProcessor:
                 return False
 
             self.items.pop(index)
-            # Re-index remaining items
-            for i, item in enumerate(self.items):
-                item.index = i
+            self._counts[item.status] -= 1
+            # Re-index items that followed the removed one
+            for i in range(index, len(self.items)):
+                self.items[i].index = i
             logger.info(f"Removed batch item {index}")
             self._notify_callbacks({'event': 'item_removed', 'index': index})
             return True
@@ -121,8 +147,10 @@ class BatchProcessor:
 
     def clear_completed(self):
         """Remove all completed or failed items"""
-        self.items = [item for item in self.items
-                      if item.status not in [BatchItemStatus.COMPLETED, BatchItemStatus.FAILED, BatchItemStatus.CANCELLED]]
+        finished = (BatchItemStatus.COMPLETED, BatchItemStatus.FAILED, BatchItemStatus.CANCELLED)
+        self.items = [item for item in self.items if item.status not in finished]
+        for status in finished:
+            self._counts[status] = 0
         # Re-index
         for i, item in enumerate(self.items):
             item.index = i
@@ -137,15 +165,22 @@ class BatchProcessor:
 
     def get_pending_count(self) -> int:
         """Get number of pending items"""
-        return sum(1 for item in self.items if item.status == BatchItemStatus.PENDING)
+        return self._counts[BatchItemStatus.PENDING]
 
     def get_completed_count(self) -> int:
         """Get number of completed items"""
-        return sum(1 for item in self.items if item.status == BatchItemStatus.COMPLETED)
+        return self._counts[BatchItemStatus.COMPLETED]
 
     def get_failed_count(self) -> int:
         """Get number of failed items"""
-        return sum(1 for item in self.items if item.status == BatchItemStatus.FAILED)
+        return self._counts[BatchItemStatus.FAILED]
+
+    def _set_status(self, item: BatchItem, status: BatchItemStatus):
+        """Change an item's status and update the per-status counts"""
+        with self._counts_lock:
+            self._counts[item.status] -= 1
+            self._counts[status] += 1
+            item.status = status
 
     def add_callback(self, callback: Callable):
         """Add callback to be notified of batch events"""
@@ -172,6 +207,7 @@ class BatchProcessor:
         self.is_running = True
         self.stop_flag.clear()
         self.pause_flag.clear()
+        self.resume_flag.set()
 
         self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.worker_thread.start()
@@ -187,12 +223,14 @@ class BatchProcessor:
 
         logger.info("Stopping batch processing...")
         self.stop_flag.set()
+        # Wake a paused worker so it sees the stop request
+        self.resume_flag.set()
         self.is_running = False
 
         # Mark pending items as cancelled
         for item in self.items:
             if item.status == BatchItemStatus.PENDING:
-                item.status = BatchItemStatus.CANCELLED
+                self._set_status(item, BatchItemStatus.CANCELLED)
 
         self._notify_callbacks({'event': 'batch_stopped'})
 
@@ -201,6 +239,7 @@ class BatchProcessor:
         if self.is_running and not self.is_paused:
             logger.info("Pausing batch processing...")
             self.pause_flag.set()
+            self.resume_flag.clear()
             self.is_paused = True
             self._notify_callbacks({'event': 'batch_paused'})
 
@@ -209,32 +248,23 @@ class BatchProcessor:
         if self.is_paused:
             logger.info("Resuming batch processing...")
             self.pause_flag.clear()
+            self.resume_flag.set()
             self.is_paused = False
             self._notify_callbacks({'event': 'batch_resumed'})
 
+    def _should_stop(self) -> bool:
+        """Wait while paused, then report whether processing should stop"""
+        self.resume_flag.wait()
+        return self.stop_flag.is_set()
+
     def _worker_loop(self):
         """Main worker loop for processing batch items"""
         try:
-            for item in self.items:
-                # Check stop flag
-                if self.stop_flag.is_set():
-                    logger.info("Batch processing stopped")
-                    break
-
-                # Check pause flag
-                while self.pause_flag.is_set():
-                    if self.stop_flag.is_set():
-                        break
-                    import time
-                    time.sleep(0.5)
-
-                # Skip non-pending items
-                if item.status != BatchItemStatus.PENDING:
-                    continue
-
-                # Process item
-                self.current_item_index = item.index
-                self._process_item(item)
+            parallelism = max(1, int(self.default_settings.get('batch_parallelism', 1)))
+            if parallelism == 1:
+                self._run_serial()
+            else:
+                self._run_parallel(parallelism)
 
             # Batch complete
             self.is_running = False
@@ -254,11 +284,56 @@ class BatchProcessor:
             self.is_running = False
             self._notify_callbacks({'event': 'batch_error', 'error': str(e)})
 
+    def _run_serial(self):
+        """Process pending items one at a time"""
+        for item in self.items:
+            if self._should_stop():
+                logger.info("Batch processing stopped")
+                break
+
+            # Skip non-pending items
+            if item.status != BatchItemStatus.PENDING:
+                continue
+
+            # Process item
+            self.current_item_index = item.index
+            self._process_item(item)
+
+    def _run_parallel(self, parallelism: int):
+        """
+        Process pending items with up to `parallelism` in flight
+
+        Threads rather than processes are used: the process function receives
+        the stop Event and usually closes over UI state, neither of which can
+        be pickled, and the heavy work (TTS, ffmpeg, libsndfile) releases the GIL.
+        Keep parallelism low when TTS runs on a single GPU to avoid VRAM contention.
+        """
+        logger.info(f"Processing batch with {parallelism} parallel workers")
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            running = set()
+            for item in self.items:
+                if self._should_stop():
+                    logger.info("Batch processing stopped")
+                    break
+
+                if item.status != BatchItemStatus.PENDING:
+                    continue
+
+                # Wait for a free worker before starting the next item
+                if len(running) >= parallelism:
+                    _, running = wait(running, return_when=FIRST_COMPLETED)
+                    if self._should_stop():
+                        logger.info("Batch processing stopped")
+                        break
+
+                self.current_item_index = item.index
+                running.add(executor.submit(self._process_item, item))
+
+            wait(running)
+
     def _process_item(self, item: BatchItem):
         """Process a single batch item"""
-        import time
-
-        item.status = BatchItemStatus.PROCESSING
+        self._set_status(item, BatchItemStatus.PROCESSING)
         item.start_time = time.time()
 
         logger.info(f"Processing batch item {item.index + 1}/{len(self.items)}: {item.get_display_name()}")
@@ -284,7 +359,7 @@ class BatchProcessor:
             # Call processing function
             result = self.process_function(item, settings, self.stop_flag)
 
-            item.status = BatchItemStatus.COMPLETED
+            self._set_status(item, BatchItemStatus.COMPLETED)
             item.output_files = result
             item.end_time = time.time()
 
@@ -292,7 +367,7 @@ class BatchProcessor:
             self._notify_callbacks({'event': 'item_completed', 'item': item})
 
         except Exception as e:
-            item.status = BatchItemStatus.FAILED
+            self._set_status(item, BatchItemStatus.FAILED)
             item.error_message = str(e)
             item.end_time = time.time()
 
@@ -327,7 +402,7 @@ class BatchProcessor:
         for item in self.items:
             item_data = {
                 'index': item.index,
-                'epub_name': Path(item.epub_path).name,
+                'epub_name': item.get_file_name(),
                 'status': item.status.value,
                 'duration': item.get_duration_string(),
                 'error': item.error_message,
@@ -0,0 +1,160 @@
+# core/chunk_cache.py
+"""
+Content-addressed cache of synthesized chunk audio.
+
+Chunks are keyed by everything that affects synthesis (text, voice, model
+and sampling parameters), so re-running a book after a small change, or
+repeated phrases across chapters, reuse earlier audio instead of running
+the model again.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import soundfile as sf
+
+from .maya1_constants import SAMPLE_RATE
+from .tts_maya1_hf import synthesize_chunk_hf
+from .utils import get_cache_path
+
+logger = logging.getLogger(__name__)
+
+# Subdirectory of the MayaBook cache holding chunk audio
+CACHE_SUBDIR = "chunks"
+
+
+def _get_cache_key(
+    text: str,
+    voice_description: str,
+    model_path: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+) -> str:
+    """
+    Generate a cache key from the chunk text and synthesis parameters.
+
+    Returns:
+        BLAKE2b hex digest
+    """
+    # Unit separator between fields so no two parameter sets hash alike
+    cache_string = "\x1f".join((
+        text,
+        voice_description,
+        os.path.abspath(model_path),
+        f"{temperature:.3f}",
+        f"{top_p:.3f}",
+        str(max_tokens),
+    ))
+    return hashlib.blake2b(cache_string.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def _get_cache_path(cache_key: str) -> Path:
+    """Get the filesystem path for a cached chunk file."""
+    return get_cache_path(CACHE_SUBDIR) / f"chunk_{cache_key}.wav"
+
+
+def _store(cache_path: Path, write) -> None:
+    """Write a cache entry through a temporary file so readers never see a partial WAV."""
+    fd, tmp_path = tempfile.mkstemp(suffix=".wav", dir=cache_path.parent)
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def synthesize_chunk_cached(
+    model_path: str,
+    text: str,
+    voice_description: str,
+    temperature: float = 0.5,
+    top_p: float = 0.95,
+    max_tokens: int = 2500,
+    return_array: bool = False,
+):
+    """
+    synthesize_chunk_hf with a disk cache in front of it.
+
+    Takes the same arguments and returns the same thing: a WAV path (which
+    points into the cache) or, with return_array, the float32 samples.
+    """
+    cache_key = _get_cache_key(text, voice_description, model_path, temperature, top_p, max_tokens)
+    cache_path = _get_cache_path(cache_key)
+
+    if cache_path.exists():
+        logger.debug(f"Chunk cache hit: {cache_path.name}")
+        if return_array:
+            audio, sr = sf.read(cache_path, dtype="float32", always_2d=False)
+            if sr == SAMPLE_RATE:
+                return audio
+            logger.warning(f"Ignoring cached chunk at {sr} Hz: {cache_path.name}")
+        elif sf.info(cache_path).samplerate == SAMPLE_RATE:
+            return str(cache_path)
+        else:
+            logger.warning(f"Ignoring cached chunk at wrong sample rate: {cache_path.name}")
+
+    result = synthesize_chunk_hf(
+        model_path=model_path,
+        text=text,
+        voice_description=voice_description,
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+        return_array=return_array,
+    )
+
+    try:
+        if return_array:
+            # FLOAT keeps the cached samples bit-identical to the array
+            _store(cache_path, lambda path: sf.write(path, result, SAMPLE_RATE, subtype="FLOAT"))
+        else:
+            _store(cache_path, lambda path: shutil.copyfile(result, path))
+            os.remove(result)
+            result = str(cache_path)
+    except OSError as e:
+        # A full or read-only cache must never fail synthesis
+        logger.warning(f"Could not cache chunk audio: {e}")
+
+    return result
+
+
+def clear_chunk_cache() -> int:
+    """
+    Delete all cached chunk audio.
+
+    Returns:
+        Number of files deleted
+    """
+    count = 0
+    for chunk_file in get_cache_path(CACHE_SUBDIR).glob("chunk_*.wav"):
+        try:
+            chunk_file.unlink()
+            count += 1
+        except Exception as e:
+            logger.warning(f"Failed to delete {chunk_file}: {e}")
+
+    logger.info(f"Cleared {count} cached chunk(s)")
+    return count
+
+
+def get_cache_size() -> tuple[int, int]:
+    """
+    Get information about the chunk cache.
+
+    Returns:
+        Tuple of (file_count, total_size_bytes)
+    """
+    files = list(get_cache_path(CACHE_SUBDIR).glob("chunk_*.wav"))
+    total_size = sum(f.stat().st_size for f in files)
+
+    return len(files), total_size
@@ -1,15 +1,76 @@
 # core/chunking.py
+import functools
 import re
+import sys
+from typing import Callable, Optional
+
+# Optional Rust chunker (pip install semantic-text-splitter)
+try:
+    from semantic_text_splitter import TextSplitter
+    TEXT_SPLITTER_AVAILABLE = True
+except ImportError:
+    TEXT_SPLITTER_AVAILABLE = False
+
+# Sentence boundary: whitespace run following terminal punctuation
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?]) +')
+# Same boundary, matched from the punctuation so the regex engine can skip
+# ahead to candidate characters instead of testing a lookbehind everywhere
+_SENT_END_RE = re.compile(r'([.!?]) +')
+# Emotion tags such as <laugh> or <cry>, excluded from word/char counts
+_EMOTION_TAG_RE = re.compile(r'<[^>]+>')
+# Natural breaks inside an over-long sentence (kept as separate split parts)
+_LONG_SPLIT_RE = re.compile(r'([,;—-]\s+)')
+# Private-use character standing in for an emotion tag while the Rust
+# splitter runs, so tags are never cut and count as a single char
+_TAG_SENTINEL = '\ue000'
+_TAG_SENTINEL_RE = re.compile(_TAG_SENTINEL)
+
+# Chunking backends accepted by chunk_text/make_chunker
+BACKEND_PYTHON = "python"
+BACKEND_TEXT_SPLITTER = "text-splitter"
+
+
+def _count(text: str) -> tuple[int, int]:
+    """Return (word_count, char_count) of text with emotion tags removed."""
+    # Most sentences carry no tags; skip the regex and its copy entirely
+    if '<' not in text:
+        return len(text.split()), len(text)
+    stripped = _EMOTION_TAG_RE.sub('', text)
+    return len(stripped.split()), len(stripped)
+
+
+@functools.lru_cache(maxsize=32)
+def _split_sentences(s: str) -> tuple[str, ...]:
+    """
+    Split s after terminal punctuation followed by spaces (same result as _SENT_SPLIT_RE.split).
 
-def chunk_text(s: str, max_chars: int = 350, max_words: int = 70) -> list[str]:
+    Results are cached, so re-chunking the same chapter (e.g. preview, then
+    the full run, or a different chunk size) skips the split. A tuple is
+    returned because the cached value is shared between callers.
+    """
+    # split() yields [text, punct, text, punct, ..., text]; glue each
+    # sentence back to its punctuation mark
+    parts = _SENT_END_RE.split(s)
+    sentences = list(map(str.__add__, parts[0:-1:2], parts[1::2]))
+    sentences.append(parts[-1])
+    return tuple(sentences)
+
+
+def chunk_text(s: str, max_chars: Optional[int] = 350, max_words: Optional[int] = 70,
+               backend: str = BACKEND_PYTHON) -> list[str]:
     """
     Splits a string into a list of strings using DUAL CONSTRAINTS (words AND chars).
     The splitting is sentence-aware and preserves emotion tags.
 
     Args:
         s: Text to chunk
-        max_words: Maximum words per chunk (default: 70, recommended for token budget with max_tokens=2500)
-        max_chars: Maximum characters per chunk (default: 350, prevents dense technical text overflow while maintaining audio continuity)
+        max_words: Maximum words per chunk (default: 70, recommended for token budget with max_tokens=2500).
+                   None disables the word limit.
+        max_chars: Maximum characters per chunk (default: 350, prevents dense technical text overflow while maintaining audio continuity).
+                   None disables the character limit.
+        backend: "python" (default) or "text-splitter" to use the Rust
+                 semantic-text-splitter package when it is installed.
+                 Falls back to the Python chunker when it is not.
 
     Returns:
         List of text chunks
@@ -30,114 +91,140 @@ def chunk_text(s: str, max_chars: int = 350, max_words: int = 70) -> list[str]:
         - 70 words × 5 chars/word × 5 tokens/char = ~1,750 tokens (safe margin with 2500 limit)
         - 70 words × 8 chars/word (280 chars, under 350 limit) × 5 tokens/char = ~2,100 tokens (safe)
     """
+    if backend != BACKEND_PYTHON:
+        return make_chunker(max_chars, max_words, backend)(s)
+    return _chunk(s, _limit(max_words), _limit(max_chars))
+
+
+def make_chunker(max_chars: Optional[int] = 350, max_words: Optional[int] = 70,
+                 backend: str = BACKEND_PYTHON) -> Callable[[str], list[str]]:
+    """
+    Build a chunk_text function with its limits bound once.
+
+    Use this when many texts are chunked with the same limits (e.g. every
+    chapter of a book); the returned function takes only the text.
+
+    Args:
+        max_chars: Maximum characters per chunk (None disables the limit)
+        max_words: Maximum words per chunk (None disables the limit)
+        backend: "python" or "text-splitter" (see chunk_text)
+
+    Returns:
+        Function mapping a text to its list of chunks
+    """
+    word_limit = _limit(max_words)
+    char_limit = _limit(max_chars)
+
+    if backend not in (BACKEND_PYTHON, BACKEND_TEXT_SPLITTER):
+        raise ValueError(f"Unknown chunking backend: {backend!r}")
+
+    if backend == BACKEND_TEXT_SPLITTER and TEXT_SPLITTER_AVAILABLE:
+        splitter = TextSplitter(char_limit)
+
+        def chunker(s: str) -> list[str]:
+            return _chunk_with_text_splitter(splitter, s, word_limit, char_limit)
+
+        return chunker
+
+    def chunker(s: str) -> list[str]:
+        return _chunk(s, word_limit, char_limit)
+
+    return chunker
+
+
+def _limit(value: Optional[int]) -> int:
+    """Normalize a chunk limit; a disabled (None) limit can never be exceeded."""
+    return sys.maxsize if value is None else value
+
+
+def _chunk(s: str, max_words: int, max_chars: int) -> list[str]:
+    """chunk_text with both limits already normalized to ints."""
     if not s:
         return []
 
+    # Fast path: text that fits both limits becomes a single chunk. Stripping
+    # emotion tags never adds words or chars, so the raw counts are an upper bound.
+    if len(s) <= max_chars and len(s.split()) <= max_words:
+        stripped = s.strip()
+        return [_SENT_SPLIT_RE.sub(' ', stripped)] if stripped else []
+
     # Use hybrid dual-constraint chunking (word AND character limits)
     return _chunk_by_words_and_chars(s, max_words, max_chars)
 
 
+def _chunk_with_text_splitter(splitter, s: str, max_words: int, max_chars: int) -> list[str]:
+    """
+    Chunk text with the Rust semantic-text-splitter, preserving emotion tags.
+
+    The splitter only knows a character capacity, so any chunk that still
+    exceeds the word limit is re-chunked by the Python path.
+    """
+    if not s:
+        return []
+
+    # Mask tags so the splitter cannot break inside one; the splitter keeps
+    # text order and drops nothing but whitespace, so tags are restored in order
+    tags = _EMOTION_TAG_RE.findall(s)
+    if tags:
+        s = _EMOTION_TAG_RE.sub(_TAG_SENTINEL, s)
+
+    chunks = []
+    for chunk in splitter.chunks(s):
+        if len(chunk.split()) > max_words:
+            chunks.extend(_chunk(chunk, max_words, max_chars))
+        else:
+            chunks.append(chunk)
+
+    if tags:
+        restore = iter(tags).__next__
+        chunks = [_TAG_SENTINEL_RE.sub(lambda _: restore(), chunk) if _TAG_SENTINEL in chunk else chunk
+                  for chunk in chunks]
+    return chunks
+
+
 def _chunk_by_words_and_chars(s: str, max_words: int, max_chars: int) -> list[str]:
     """
     Chunk text respecting BOTH word count AND character limits (whichever is exceeded first).
     This prevents dense technical text from exceeding token budgets.
     """
     # Split by sentences, preserving emotion tags
-    sentences = re.split(r'(?<=[.!?]) +', s.strip())
+    sentences = [sentence for sentence in _split_sentences(s.strip()) if sentence]
+    # Count every sentence up front (excluding emotion tags) so the packing
+    # loop below only does integer work and slices sentence ranges
+    counts = list(map(_count, sentences))
 
     chunks = []
-    current_chunk = ""
+    # Index of the first sentence of the chunk being built
+    chunk_start = 0
     current_word_count = 0
     current_char_count = 0
 
-    for sentence in sentences:
-        if not sentence:
-            continue
-
-        # Count words (excluding emotion tags)
-        sentence_text = re.sub(r'<[^>]+>', '', sentence)
-        sentence_words = len(sentence_text.split())
-        sentence_chars = len(sentence_text)
-
+    for i, (sentence_words, sentence_chars) in enumerate(counts):
         # If a single sentence exceeds EITHER limit, split it further
         if sentence_words > max_words or sentence_chars > max_chars:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-                current_word_count = 0
-                current_char_count = 0
+            if chunk_start < i:
+                chunks.append(" ".join(sentences[chunk_start:i]).strip())
 
             # Split long sentence at commas or natural breaks
-            chunks.extend(_split_long_sentence(sentence, max_words, max_chars))
+            chunks.extend(_split_long_sentence(sentences[i], max_words, max_chars))
+            chunk_start = i + 1
+            current_word_count = 0
+            current_char_count = 0
             continue
 
         # Check if adding this sentence would exceed EITHER word or character limit
         if (current_word_count + sentence_words > max_words or
-            current_char_count + sentence_chars > max_chars) and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = sentence
+            current_char_count + sentence_chars > max_chars) and chunk_start < i:
+            chunks.append(" ".join(sentences[chunk_start:i]).strip())
+            chunk_start = i
             current_word_count = sentence_words
             current_char_count = sentence_chars
         else:
-            if current_chunk:
-                current_chunk += " " + sentence
-            else:
-                current_chunk = sentence
             current_word_count += sentence_words
             current_char_count += sentence_chars
 
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    return chunks
-
-
-def _chunk_by_words(s: str, max_words: int) -> list[str]:
-    """
-    Chunk text by word count, sentence-aware, preserving emotion tags.
-    Recommended: 80-100 words per chunk for optimal TTS quality.
-    """
-    # Split by sentences, but preserve emotion tags
-    # Emotion tags: <laugh>, <cry>, <angry>, <excited>, etc.
-    sentences = re.split(r'(?<=[.!?]) +', s.strip())
-
-    chunks = []
-    current_chunk = ""
-    current_word_count = 0
-
-    for sentence in sentences:
-        if not sentence:
-            continue
-
-        # Count words (excluding emotion tags from word count)
-        sentence_text = re.sub(r'<[^>]+>', '', sentence)
-        sentence_words = len(sentence_text.split())
-
-        # If a single sentence exceeds max_words, split it
-        if sentence_words > max_words:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-                current_word_count = 0
-
-            # Split long sentence at commas or natural breaks
-            chunks.extend(_split_long_sentence(sentence, max_words))
-            continue
-
-        # Check if adding this sentence would exceed word limit
-        if current_word_count + sentence_words > max_words and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = sentence
-            current_word_count = sentence_words
-        else:
-            if current_chunk:
-                current_chunk += " " + sentence
-            else:
-                current_chunk = sentence
-            current_word_count += sentence_words
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    if chunk_start < len(sentences):
+        chunks.append(" ".join(sentences[chunk_start:]).strip())
 
     return chunks
 
@@ -145,10 +232,11 @@ def _chunk_by_words(s: str, max_words: int) -> list[str]:
 def _split_long_sentence(sentence: str, max_words: int, max_chars: int) -> list[str]:
     """Split a very long sentence at commas or other natural breaks, respecting BOTH word and char limits."""
     # Try splitting at commas, semicolons, or dashes
-    parts = re.split(r'([,;—-]\s+)', sentence)
+    parts = _LONG_SPLIT_RE.split(sentence)
 
     chunks = []
-    current = ""
+    # Parts keep their separators, so they are joined back without spaces
+    current = []
     current_words = 0
     current_chars = 0
 
@@ -156,63 +244,21 @@ def _split_long_sentence(sentence: str, max_words: int, max_chars: int) -> list[
         if not part:
             continue
 
-        part_text = re.sub(r'<[^>]+>', '', part)
-        part_words = len(part_text.split())
-        part_chars = len(part_text)
+        part_words, part_chars = _count(part)
 
         # Check BOTH word and character constraints
         if (current_words + part_words > max_words or
             current_chars + part_chars > max_chars) and current:
-            chunks.append(current.strip())
-            current = part
+            chunks.append("".join(current).strip())
+            current = [part]
             current_words = part_words
             current_chars = part_chars
         else:
-            current += part
+            current.append(part)
             current_words += part_words
             current_chars += part_chars
 
     if current:
-        chunks.append(current.strip())
+        chunks.append("".join(current).strip())
 
     return chunks if chunks else [sentence]
-
-
-def _chunk_by_chars(s: str, max_chars: int) -> list[str]:
-    """
-    Original character-based chunking (fallback method).
-    """
-    sentences = re.split(r'(?<=[.!?]) +', s.strip())
-
-    chunks = []
-    current_chunk = ""
-
-    for sentence in sentences:
-        if not sentence:
-            continue
-
-        # If a sentence is longer than max_chars, it's hard-wrapped.
-        if len(sentence) > max_chars:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-
-            for i in range(0, len(sentence), max_chars):
-                chunks.append(sentence[i:i+max_chars])
-            continue
-
-        # If adding the new sentence exceeds the limit, push the current chunk.
-        if len(current_chunk) + len(sentence) + 1 > max_chars:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = sentence
-        else:
-            if current_chunk:
-                current_chunk += " " + sentence
-            else:
-                current_chunk = sentence
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-
-    return chunks
@@ -2,14 +2,28 @@
 """
 Configuration management and smart defaults
 """
+import atexit
+import copy
+import functools
 import json
 import logging
+import os
+import threading
+import weakref
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Optional, List
 from platformdirs import user_config_dir, user_data_dir
 
 logger = logging.getLogger(__name__)
 
+# Optional: orjson is a faster drop-in for reading/writing the config file
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Default configuration
 DEFAULT_CONFIG = {
     'last_used': {
@@ -38,18 +52,56 @@ DEFAULT_CONFIG = {
     'profiles': {}
 }
 
+# Top-level sections of DEFAULT_CONFIG whose values are never merged key by key
+_FLAT_SECTIONS = ('last_used', 'recent_files', 'gui_settings', 'profiles')
+
+
+@functools.lru_cache(maxsize=None)
+def _config_dir_for(app_name: str) -> Path:
+    """Per-user config directory for app_name (platformdirs lookups are cached)"""
+    return Path(user_config_dir(app_name))
+
+
+# Config directories already created by this process
+_ensured_dirs = set()
+
+# Live ConfigManager instances, flushed at exit. Weak references, so the exit
+# hook does not keep every instance alive; an instance with a pending save is
+# held by its timer until the save is written.
+_instances = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    """Write pending changes of every live ConfigManager"""
+    for manager in list(_instances):
+        manager.flush()
+
 
 class ConfigManager:
     """Manages application configuration and user preferences"""
 
+    # Seconds to wait for further changes before writing the config file
+    SAVE_DELAY = 0.25
+
     def __init__(self, app_name: str = "MayaBook"):
         self.app_name = app_name
-        self.config_dir = Path(user_config_dir(app_name))
+        self.config_dir = _config_dir_for(app_name)
         self.config_file = self.config_dir / "config.json"
-        self.config = DEFAULT_CONFIG.copy()
+        # Deep copy so instances never share (and mutate) the default section dicts
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
+
+        # Saves are coalesced: save() marks the config dirty and a short timer
+        # writes it once, so bursts of setter calls produce a single write
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        _instances.add(self)
 
         # Ensure config directory exists
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        if self.config_dir not in _ensured_dirs:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(self.config_dir)
 
         # Load existing config
         self.load()
@@ -58,10 +110,11 @@ class ConfigManager:
         """Load configuration from file"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to handle new keys
-                    self._merge_configs(self.config, loaded)
+                with open(self.config_file, 'rb') as f:
+                    data = f.read()
+                loaded = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+                # Merge with defaults to handle new keys
+                self._merge_loaded(loaded)
                 logger.info(f"Configuration loaded from {self.config_file}")
         except Exception as e:
             logger.warning(f"Could not load config: {e}. Using defaults.")
@@ -69,14 +122,51 @@ class ConfigManager:
         return self.config
 
     def save(self):
+        """Schedule a save of the configuration (written after SAVE_DELAY seconds)"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Write any pending configuration changes to file now"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_now()
+
+    def _save_now(self):
         """Save configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.config, indent=2).encode('utf-8')
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
             logger.info(f"Configuration saved to {self.config_file}")
         except Exception as e:
             logger.error(f"Could not save config: {e}")
 
+    def _merge_loaded(self, loaded: Dict):
+        """Merge a loaded config file into the current config"""
+        for key, value in loaded.items():
+            section = self.config.get(key)
+            if key in _FLAT_SECTIONS and isinstance(section, dict) and isinstance(value, dict):
+                # Known sections hold plain values (or whole profiles), so a
+                # shallow update gives the same result as a recursive merge
+                section.update(value)
+            elif isinstance(section, dict) and isinstance(value, dict):
+                self._merge_configs(section, value)
+            else:
+                self.config[key] = value
+
     def _merge_configs(self, base: Dict, update: Dict):
         """Recursively merge update dict into base dict"""
         for key, value in update.items():
@@ -103,16 +193,11 @@ class ConfigManager:
         if category not in self.config['recent_files']:
             self.config['recent_files'][category] = []
 
-        recent = self.config['recent_files'][category]
-
-        # Remove if already exists
-        if file_path in recent:
-            recent.remove(file_path)
-
-        # Add to front
-        recent.insert(0, file_path)
-
-        # Trim to max
+        # Rebuild in one pass: new entry at the front, then the remaining
+        # entries in order without it, stopping once max_recent is reached
+        others = (p for p in self.config['recent_files'][category] if p != file_path)
+        recent = [file_path]
+        recent.extend(islice(others, max(max_recent - 1, 0)))
         self.config['recent_files'][category] = recent[:max_recent]
         self.save()
 
@@ -174,10 +259,15 @@ def find_default_model() -> Optional[str]:
             continue
 
         # Look for HF model directory (config.json + model shards)
-        for candidate in base_path.iterdir():
-            if candidate.is_dir() and (candidate / "config.json").exists():
-                logger.info(f"Found default model directory: {candidate}")
-                return str(candidate)
+        try:
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "config.json")):
+                        candidate = base_path / entry.name
+                        logger.info(f"Found default model directory: {candidate}")
+                        return str(candidate)
+        except OSError as e:
+            logger.debug(f"Could not scan {base_path}: {e}")
 
     return None
 
@@ -200,10 +290,16 @@ def find_default_epub() -> Optional[str]:
         if not base_path.exists():
             continue
 
-        epub_files = list(base_path.glob('*.epub'))
-        if epub_files:
-            logger.info(f"Found default EPUB: {epub_files[0]}")
-            return str(epub_files[0])
+        # First .epub entry, stopping the directory scan as soon as one is found
+        try:
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if os.path.normcase(entry.name).endswith('.epub'):
+                        epub_file = base_path / entry.name
+                        logger.info(f"Found default EPUB: {epub_file}")
+                        return str(epub_file)
+        except OSError as e:
+            logger.debug(f"Could not scan {base_path}: {e}")
 
     return None
 
@@ -229,17 +325,37 @@ def find_matching_cover(epub_path: str) -> Optional[str]:
     base_name = epub_path.stem
     epub_dir = epub_path.parent
 
+    # List the directory once and check candidates in memory, case-insensitively
+    # like the case-insensitive filesystems of Windows and macOS
+    names = {}
+    try:
+        with os.scandir(epub_dir) as entries:
+            for entry in entries:
+                names.setdefault(entry.name.lower(), []).append(entry.name)
+    except OSError as e:
+        logger.debug(f"Could not scan {epub_dir}: {e}")
+        return None
+
+    def existing_name(file_name):
+        """Real name of the entry matching file_name, preferring an exact match"""
+        matches = names.get(file_name.lower())
+        if not matches:
+            return None
+        return file_name if file_name in matches else matches[0]
+
     for ext in ['.jpg', '.jpeg', '.png', '.webp']:
-        cover_path = epub_dir / f"{base_name}{ext}"
-        if cover_path.exists():
+        file_name = existing_name(f"{base_name}{ext}")
+        if file_name:
+            cover_path = epub_dir / file_name
             logger.info(f"Found matching cover: {cover_path}")
             return str(cover_path)
 
     # Look for generic cover names
     for name in ['cover', 'Cover', 'COVER']:
         for ext in ['.jpg', '.jpeg', '.png', '.webp']:
-            cover_path = epub_dir / f"{name}{ext}"
-            if cover_path.exists():
+            file_name = existing_name(f"{name}{ext}")
+            if file_name:
+                cover_path = epub_dir / file_name
                 logger.info(f"Found generic cover: {cover_path}")
                 return str(cover_path)
 
@@ -1,9 +1,66 @@
 import ebooklib
 from ebooklib import epub
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit, XMLParsedAsHTMLWarning
+from io import BytesIO
 import logging
+import mmap
+import os
+import posixpath
 import re
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Tuple, List, Dict, Optional
+from urllib.parse import unquote
+
+# lxml is the fast C parser used both directly and as BeautifulSoup's tree
+# builder; without it everything goes through bs4's pure-Python html.parser
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+BS4_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# EPUB chapters are XHTML; they are deliberately parsed with the lenient lxml
+# HTML parser, so bs4's suggestion to switch to an XML parser is just noise.
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+# Only ebooklib's warnings are of interest; per-item debug/info records would
+# be formatted and locked for on every item of large books
+logging.getLogger('ebooklib').setLevel(logging.WARNING)
+
+# (metadata key, Dublin Core field) pairs read by extract_metadata
+_DC_METADATA_FIELDS = (
+    ('title', 'title'),
+    ('author', 'creator'),
+    ('publisher', 'publisher'),
+    ('language', 'language'),
+    ('year', 'date'),
+    ('description', 'description'),
+    ('genre', 'subject'),
+)
+
+# Year inside a free-form date (YYYY, YYYY-MM-DD, ...)
+_YEAR_RE = re.compile(r'\d{4}')
+# Custom chapter marker, e.g. <<CHAPTER_MARKER:Chapter Name>>
+_CHAPTER_MARKER_PREFIX = "<<CHAPTER_MARKER:"
+_CHAPTER_MARKER_SUFFIX = ">>"
+
+# Elements whose text is not part of the readable document (BeautifulSoup's
+# get_text skips them as well)
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+# Manifest media types that never contribute text; their content is not read
+_MEDIA_TYPE_PREFIXES = ('image/', 'audio/', 'video/', 'font/', 'application/font',
+                        'application/x-font', 'application/vnd.ms-opentype')
+
+# Books with at least this much chapter HTML are parsed in parallel; for
+# smaller books the pool start-up costs more than it saves. With lxml the
+# parsing happens in libxml2, which releases the GIL, so a cheap thread pool
+# is used; BeautifulSoup's pure-Python parser needs a process pool.
+PARALLEL_PARSE_MIN_BYTES = 4 * 1024 * 1024
+THREADED_PARSE_MIN_BYTES = 256 * 1024
 
 
 def extract_text(epub_path: str) -> str:
@@ -23,7 +80,14 @@ def extract_text(epub_path: str) -> str:
         return "Error: Could not extract any text from the EPUB."
 
     # Combine all chapter texts
-    return "\n\n".join(text for _, text in chapters)
+    # A list (not a generator) lets str.join size the result in one pass
+    return "\n\n".join([text for _, text in chapters])
+
+
+def _first(values: list):
+    """First value of a get_metadata result; entries are (value, attributes) tuples."""
+    value = values[0]
+    return value[0] if isinstance(value, tuple) else value
 
 
 def extract_metadata(book: epub.EpubBook) -> Dict[str, str]:
@@ -39,44 +103,19 @@ def extract_metadata(book: epub.EpubBook) -> Dict[str, str]:
     metadata = {}
 
     try:
-        # Title
-        title = book.get_metadata('DC', 'title')
-        if title:
-            metadata['title'] = title[0][0] if isinstance(title[0], tuple) else title[0]
-
-        # Creator/Author
-        creator = book.get_metadata('DC', 'creator')
-        if creator:
-            metadata['author'] = creator[0][0] if isinstance(creator[0], tuple) else creator[0]
-
-        # Publisher
-        publisher = book.get_metadata('DC', 'publisher')
-        if publisher:
-            metadata['publisher'] = publisher[0][0] if isinstance(publisher[0], tuple) else publisher[0]
-
-        # Language
-        language = book.get_metadata('DC', 'language')
-        if language:
-            metadata['language'] = language[0][0] if isinstance(language[0], tuple) else language[0]
-
-        # Date
-        date = book.get_metadata('DC', 'date')
-        if date:
-            date_str = date[0][0] if isinstance(date[0], tuple) else date[0]
-            # Extract year from date string (format varies: YYYY, YYYY-MM-DD, etc.)
-            year_match = re.search(r'\d{4}', date_str)
-            if year_match:
-                metadata['year'] = year_match.group(0)
-
-        # Description
-        description = book.get_metadata('DC', 'description')
-        if description:
-            metadata['description'] = description[0][0] if isinstance(description[0], tuple) else description[0]
-
-        # Subject/Genre
-        subject = book.get_metadata('DC', 'subject')
-        if subject:
-            metadata['genre'] = subject[0][0] if isinstance(subject[0], tuple) else subject[0]
+        for key, dc_field in _DC_METADATA_FIELDS:
+            values = book.get_metadata('DC', dc_field)
+            if not values:
+                continue
+
+            value = _first(values)
+            if key == 'year':
+                # Extract year from date string (format varies: YYYY, YYYY-MM-DD, etc.)
+                year_match = _YEAR_RE.search(value)
+                if year_match:
+                    metadata['year'] = year_match.group(0)
+            else:
+                metadata[key] = value
 
     except Exception as e:
         logging.warning(f"Error extracting some metadata: {e}")
@@ -98,7 +137,7 @@ def extract_chapters(epub_path: str) -> Tuple[Dict[str, str], List[Tuple[str, st
     """
     try:
         logging.info(f"Extracting chapters and metadata from {epub_path}...")
-        book = epub.read_epub(epub_path)
+        book = _read_epub(epub_path)
 
         # Extract metadata
         metadata = extract_metadata(book)
@@ -131,55 +170,161 @@ def extract_chapters(epub_path: str) -> Tuple[Dict[str, str], List[Tuple[str, st
         return {}, [("Text", f"Error: Could not extract text from {epub_path}. The file might be corrupted or not a valid EPUB.")]
 
 
+class _MappedFile(mmap.mmap):
+    """Read-only mmap usable as a ZipFile file object (mmap lacks seekable() before 3.13)."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+class _TextOnlyEpubReader(epub.EpubReader):
+    """
+    EpubReader that does not read images, fonts, audio or video.
+
+    ebooklib reads every manifest entry into memory; for illustrated books
+    that is mostly media extraction never looks at. Those items are still
+    added to the book (so hrefs and the TOC resolve), just with empty content.
+    """
+
+    def _load_manifest(self):
+        manifest = self.container.find(f"{{{epub.NAMESPACES['OPF']}}}manifest")
+        self._skipped_files = set()
+        if manifest is not None:
+            for item in manifest:
+                media_type = item.get("media-type") or ""
+                href = item.get("href")
+                if href and media_type.startswith(_MEDIA_TYPE_PREFIXES):
+                    self._skipped_files.add(posixpath.normpath(posixpath.join(self.opf_dir, unquote(href))))
+        super()._load_manifest()
+
+    def read_file(self, name):
+        if posixpath.normpath(name) in getattr(self, '_skipped_files', ()):
+            return b""
+        return super().read_file(name)
+
+
+def _load_epub(source) -> epub.EpubBook:
+    """epub.read_epub, using _TextOnlyEpubReader."""
+    reader = _TextOnlyEpubReader(source)
+    book = reader.load()
+    reader.process()
+    return book
+
+
+def _read_epub(epub_path: str) -> epub.EpubBook:
+    """
+    Read an EPUB through a read-only memory map of the file.
+
+    The ZIP central directory and the entries ebooklib loads are paged in
+    from the page cache instead of going through buffered file reads and
+    seeks. Falls back to a plain read for directories and unmappable files.
+    """
+    if os.path.isdir(epub_path):
+        return _load_epub(epub_path)
+
+    with open(epub_path, 'rb') as f:
+        try:
+            mapped = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and some special files cannot be mapped
+            return _load_epub(epub_path)
+
+    # ebooklib copies every entry it keeps into bytes, so the map can be
+    # closed as soon as the book is loaded
+    with mapped:
+        return _load_epub(mapped)
+
+
 def _extract_from_toc(book: epub.EpubBook, toc: list) -> List[Tuple[str, str]]:
     """Extract chapters using table of contents structure."""
-    chapters = []
-
-    def process_toc_item(item, chapter_num=[1]):
-        """Recursively process TOC items (handles nested chapters)."""
+    # Collect the linked documents in reading order first, then parse them
+    # together. Nested sections are walked with an explicit stack (pushed in
+    # reverse so they pop in reading order) instead of recursion.
+    links = []
+    stack = list(reversed(toc))
+
+    while stack:
+        item = stack.pop()
         if isinstance(item, tuple):
             # Section with sub-items
             section_title, section_items = item
             if isinstance(section_title, epub.Link):
                 # Section has its own content
-                text = _extract_item_text(book, section_title.href)
-                if text.strip():
-                    chapters.append((section_title.title or f"Chapter {chapter_num[0]}", text))
-                    chapter_num[0] += 1
-            # Process sub-items
-            for sub_item in section_items:
-                process_toc_item(sub_item, chapter_num)
+                links.append(section_title)
+            stack.extend(reversed(section_items))
         elif isinstance(item, epub.Link):
             # Direct chapter link
-            text = _extract_item_text(book, item.href)
-            if text.strip():
-                chapters.append((item.title or f"Chapter {chapter_num[0]}", text))
-                chapter_num[0] += 1
+            links.append(item)
         elif isinstance(item, list):
             # List of items
-            for sub_item in item:
-                process_toc_item(sub_item, chapter_num)
+            stack.extend(reversed(item))
 
-    for item in toc:
-        process_toc_item(item)
+    # Resolve hrefs through one dict instead of a linear item scan per link;
+    # setdefault keeps the first item per name, like get_item_with_href
+    href_map = {}
+    for item in book.get_items():
+        href_map.setdefault(item.get_name(), item)
+
+    contents = [_get_item_content(href_map, link.href) for link in links]
+    texts = _parse_documents(contents, _parse_html_content_safe)
+
+    chapters = []
+    chapter_num = 1
+    for link, text in zip(links, texts):
+        if text.strip():
+            chapters.append((link.title or f"Chapter {chapter_num}", text))
+            chapter_num += 1
 
     return chapters
 
 
-def _extract_item_text(book: epub.EpubBook, href: str) -> str:
-    """Extract text from a specific EPUB item by href."""
+def _get_item_content(href_map: Dict[str, epub.EpubItem], href: str) -> bytes:
+    """Return the raw content of the document item at href, or b'' if there is none."""
     # Remove anchor if present
     item_id = href.split('#')[0]
 
     try:
-        item = book.get_item_with_href(item_id)
+        item = href_map.get(item_id)
         if item and item.get_type() == ebooklib.ITEM_DOCUMENT:
-            content = item.get_content()
-            return _parse_html_content(content)
+            return item.get_content()
     except Exception as e:
         logging.warning(f"Could not extract text from {href}: {e}")
 
-    return ""
+    return b""
+
+
+def _parse_html_content_safe(content: bytes) -> str:
+    """_parse_html_content that logs and returns '' instead of raising."""
+    if not content:
+        return ""
+    try:
+        return _parse_html_content(content)
+    except Exception as e:
+        logging.warning(f"Could not parse chapter HTML: {e}")
+        return ""
+
+
+def _parse_documents(contents: List[bytes], parse=None) -> List[str]:
+    """
+    Parse several HTML documents, in parallel for large books.
+
+    Chapters are independent and results keep the order of contents.
+    """
+    parse = parse or _parse_html_content
+    total_bytes = sum(len(c) for c in contents)
+    min_bytes = THREADED_PARSE_MIN_BYTES if LXML_AVAILABLE else PARALLEL_PARSE_MIN_BYTES
+    if len(contents) > 1 and total_bytes >= min_bytes:
+        workers = min(len(contents), os.cpu_count() or 1)
+        if workers > 1:
+            try:
+                if LXML_AVAILABLE:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        return list(executor.map(parse, contents))
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    return list(executor.map(parse, contents, chunksize=4))
+            except Exception as e:
+                logging.warning(f"Parallel chapter parsing failed, parsing serially: {e}")
+    return [parse(c) for c in contents]
 
 
 def _extract_all_documents(book: epub.EpubBook) -> List[Tuple[str, str]]:
@@ -187,53 +332,183 @@ def _extract_all_documents(book: epub.EpubBook) -> List[Tuple[str, str]]:
     chapters = []
     chapter_num = 1
 
-    for item in book.get_items():
-        if item.get_type() == ebooklib.ITEM_DOCUMENT:
-            content = item.get_content()
-            text = _parse_html_content(content)
-
-            if text.strip():
-                # Try to extract title from HTML
-                try:
-                    soup = BeautifulSoup(content, 'html.parser')
-                    title_tag = soup.find(['h1', 'h2', 'title'])
-                    if title_tag:
-                        title = title_tag.get_text().strip()
-                    else:
-                        title = f"Chapter {chapter_num}"
-                except:
-                    title = f"Chapter {chapter_num}"
-
-                chapters.append((title, text))
-                chapter_num += 1
+    contents = [item.get_content() for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT)]
+    documents = _parse_documents(contents, _parse_titled_document)
+
+    for title, text in documents:
+        if text.strip():
+            chapters.append((title if title is not None else f"Chapter {chapter_num}", text))
+            chapter_num += 1
 
     return chapters
 
 
-def _parse_html_content(content: bytes) -> str:
-    """Parse HTML content and extract clean text."""
-    soup = BeautifulSoup(content, 'html.parser')
+def _parse_titled_document(content: bytes) -> Tuple[Optional[str], str]:
+    """
+    Parse a document once for both its title and its text.
 
-    # Extract text from each paragraph separately to preserve paragraph breaks
-    text_parts = []
-    paragraphs = soup.find_all('p')
+    Returns:
+        (title, text) where title is the text of the first h1/h2/title
+        element, or None if there is none
+    """
+    root = _lxml_root(content)
+    if root is None:
+        soup = _soup_from_content(content)
+        title_tag = soup.find(['h1', 'h2', 'title'])
+        title = title_tag.get_text().strip() if title_tag else None
+        return title, _text_from_soup(soup)
+
+    title_tag = next(root.iter('h1', 'h2', 'title'), None)
+    title = ''.join(title_tag.itertext()).strip() if title_tag is not None else None
+    return title, _text_from_root(root)
+
+
+def _is_utf8(content: bytes) -> bool:
+    """Whether content decodes as UTF-8."""
+    try:
+        content.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _lxml_root(content: bytes):
+    """
+    Parse a document into an lxml element tree, without BeautifulSoup.
+
+    Returns:
+        The root element with script/style elements removed, or None if the
+        document should go through BeautifulSoup instead (lxml missing,
+        non-UTF-8 content or a parse failure)
+    """
+    if not LXML_AVAILABLE or not _is_utf8(content):
+        return None
+    try:
+        root = etree.fromstring(content, etree.HTMLParser(encoding='utf-8'))
+    except etree.Error:
+        return None
+    if root is not None:
+        etree.strip_elements(root, *_NON_TEXT_TAGS, with_tail=False)
+    return root
 
+
+def _text_from_root(root) -> str:
+    """Extract clean text from an lxml document tree (see _text_from_soup)."""
+    paragraphs = [''.join(p.itertext()) for p in root.iter('p')]
     if paragraphs:
-        for p in paragraphs:
-            p_text = p.get_text().strip()
-            if p_text:  # Only add non-empty paragraphs
-                text_parts.append(p_text)
-    else:
-        # Fallback to whole text if no <p> tags found
-        text = soup.get_text()
-        if text.strip():
-            text_parts.append(text.strip())
+        return _join_paragraphs(paragraphs)
+
+    # Fallback to whole text if no <p> tags found
+    return _normalize_spaces(''.join(root.itertext())).strip()
+
+
+def _paragraph_texts(content: bytes) -> Optional[List[str]]:
+    """
+    Collect the text of every <p> element with a streaming lxml parse.
+
+    Paragraphs are cleared (along with the siblings before them) as soon as
+    they close, so the full chapter tree is never held in memory.
+
+    Returns:
+        Paragraph texts in document order, or None if the content could not
+        be streamed (e.g. it is not UTF-8) and should go through BeautifulSoup
+    """
+    # EPUB XHTML is UTF-8; libxml2 would silently mangle anything else,
+    # so other encodings are left to BeautifulSoup's detection
+    if not LXML_AVAILABLE or not _is_utf8(content):
+        return None
+
+    texts = []
+    # Slots of the currently open paragraphs; nested paragraphs are reported
+    # in start-tag order, like BeautifulSoup's find_all
+    open_slots = []
+    # Depth inside script/style/template elements, whose <p>s are not text
+    non_text_depth = 0
+    try:
+        for event, element in etree.iterparse(BytesIO(content), events=('start', 'end'),
+                                              tag=('p', *_NON_TEXT_TAGS), html=True, encoding='utf-8'):
+            if element.tag != 'p':
+                non_text_depth += 1 if event == 'start' else -1
+                continue
+            if non_text_depth:
+                # Skipped, as _lxml_root strips them before looking for <p>s
+                continue
+
+            if event == 'start':
+                open_slots.append(len(texts))
+                texts.append(None)
+                continue
+
+            # Same text as _lxml_root gives: script/style/template content dropped
+            etree.strip_elements(element, *_NON_TEXT_TAGS, with_tail=False)
+            texts[open_slots.pop()] = ''.join(element.itertext())
+            if not open_slots:
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                while element.getprevious() is not None:
+                    del parent[0]
+    except etree.Error:
+        return None
+
+    return texts
+
+
+def _normalize_spaces(text: str) -> str:
+    """Replace non-breaking spaces with regular spaces."""
+    # ASCII-only text (most English books) cannot contain U+00A0
+    if text.isascii():
+        return text
+    return text.replace('\xa0', ' ')
+
+
+def _soup_from_content(content: bytes) -> BeautifulSoup:
+    """Build the BeautifulSoup tree of an HTML document."""
+    # The lxml builder guesses badly at undeclared non-UTF-8 encodings (e.g.
+    # cp1252), so such content is decoded with bs4's own detection first
+    if BS4_PARSER != 'html.parser' and not _is_utf8(content):
+        markup = UnicodeDammit(content, is_html=True).unicode_markup
+        if markup is not None:
+            return BeautifulSoup(markup, BS4_PARSER)
+    return BeautifulSoup(content, BS4_PARSER)
+
+
+def _text_from_soup(soup: BeautifulSoup) -> str:
+    """Extract clean text from a parsed document."""
+    paragraphs = [p.get_text() for p in soup.find_all('p')]
+    if paragraphs:
+        return _join_paragraphs(paragraphs)
+
+    # Fallback to whole text if no <p> tags found
+    return _normalize_spaces(soup.get_text()).strip()
+
+
+def _join_paragraphs(paragraphs: List[str]) -> str:
+    """Join non-empty paragraph texts with blank lines between them."""
+    # Non-breaking spaces are normalized per paragraph, while each string is
+    # small, rather than in a second pass over the joined chapter.
+    text_parts = []
+    for p_text in paragraphs:
+        p_text = _normalize_spaces(p_text).strip()
+        if p_text:  # Only add non-empty paragraphs
+            text_parts.append(p_text)
+
+    # Join with double newlines
+    return "\n\n".join(text_parts)
 
-    # Join with double newlines and normalize
-    text_content = "\n\n".join(text_parts)
-    text_content = text_content.replace('\xa0', ' ')  # Replace non-breaking space
 
-    return text_content
+def _parse_html_content(content: bytes) -> str:
+    """Parse HTML content and extract clean text."""
+    # Extract text from each paragraph separately to preserve paragraph breaks
+    paragraphs = _paragraph_texts(content)
+    if paragraphs:
+        return _join_paragraphs(paragraphs)
+
+    # No <p> tags to stream: take the whole text from a tree. Content that
+    # could not be streamed at all goes through BeautifulSoup.
+    root = _lxml_root(content) if paragraphs is not None else None
+    if root is not None:
+        return _text_from_root(root)
+    return _text_from_soup(_soup_from_content(content))
 
 
 def _check_for_chapter_markers(chapters: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
@@ -242,22 +517,17 @@ def _check_for_chapter_markers(chapters: List[Tuple[str, str]]) -> List[Tuple[st
 
     Supports markers like: <<CHAPTER_MARKER:Chapter Name>>
     """
-    # Check if any chapter contains markers
-    has_markers = False
-    for _, text in chapters:
-        if '<<CHAPTER_MARKER:' in text:
-            has_markers = True
-            break
+    texts = [text for _, text in chapters]
 
-    if not has_markers:
+    # Check if any chapter contains markers
+    if not any(_CHAPTER_MARKER_PREFIX in text for text in texts):
         return chapters
 
     # Combine all text and re-split by markers
     logging.info("Found custom chapter markers, re-splitting chapters")
-    all_text = "\n\n".join(text for _, text in chapters)
+    all_text = texts[0] if len(texts) == 1 else "\n\n".join(texts)
 
-    chapter_pattern = r"<<CHAPTER_MARKER:(.*?)>>"
-    chapter_splits = list(re.finditer(chapter_pattern, all_text))
+    chapter_splits = _find_chapter_markers(all_text)
 
     if not chapter_splits:
         return chapters
@@ -265,23 +535,48 @@ def _check_for_chapter_markers(chapters: List[Tuple[str, str]]) -> List[Tuple[st
     new_chapters = []
 
     # Add introduction if there's content before first marker
-    first_start = chapter_splits[0].start()
+    first_start = chapter_splits[0][0]
     if first_start > 0:
         intro_text = all_text[:first_start].strip()
         if intro_text:
             new_chapters.append(("Introduction", intro_text))
 
     # Extract each marked chapter
-    for idx, match in enumerate(chapter_splits):
-        start = match.end()
-        end = chapter_splits[idx + 1].start() if idx + 1 < len(chapter_splits) else len(all_text)
-        chapter_name = match.group(1).strip()
+    for idx, (_, start, chapter_name) in enumerate(chapter_splits):
+        end = chapter_splits[idx + 1][0] if idx + 1 < len(chapter_splits) else len(all_text)
+        chapter_name = chapter_name.strip()
+        # The slice runs from one marker's end to the next marker's start,
+        # so it never contains a marker
         chapter_text = all_text[start:end].strip()
 
-        # Remove the marker from the text
-        chapter_text = re.sub(r"<<CHAPTER_MARKER:.*?>>", "", chapter_text).strip()
-
         if chapter_text:
             new_chapters.append((chapter_name, chapter_text))
 
     return new_chapters
+
+
+def _find_chapter_markers(text: str) -> List[Tuple[int, int, str]]:
+    """
+    Find every <<CHAPTER_MARKER:name>> in text with plain substring searches.
+
+    Matches what re.finditer(r"<<CHAPTER_MARKER:(.*?)>>") finds, including
+    that a name cannot span a line break.
+
+    Returns:
+        (marker_start, marker_end, name) for each marker, in order
+    """
+    markers = []
+    prefix_len = len(_CHAPTER_MARKER_PREFIX)
+    pos = text.find(_CHAPTER_MARKER_PREFIX)
+    while pos != -1:
+        name_start = pos + prefix_len
+        name_end = text.find(_CHAPTER_MARKER_SUFFIX, name_start)
+        if name_end == -1:
+            break
+        if text.find('\n', name_start, name_end) == -1:
+            marker_end = name_end + len(_CHAPTER_MARKER_SUFFIX)
+            markers.append((pos, marker_end, text[name_start:name_end]))
+            pos = text.find(_CHAPTER_MARKER_PREFIX, marker_end)
+        else:
+            pos = text.find(_CHAPTER_MARKER_PREFIX, pos + 1)
+    return markers
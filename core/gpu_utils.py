@@ -3,17 +3,76 @@
 GPU detection and VRAM management utilities
 """
 import logging
+import os
+import stat
 import subprocess
 import re
-from pathlib import Path
+import time
 from typing import Optional, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# NVML (pip install nvidia-ml-py) answers GPU queries in-process, without
+# spawning nvidia-smi and parsing its CSV output
+try:
+    import pynvml
+    NVML_AVAILABLE = True
+except ImportError:
+    NVML_AVAILABLE = False
+
+# NVML handle of GPU 0; None until first use, False if NVML failed to start
+_nvml_handle = None
+
+# Seconds a GPU query result is reused before the GPU is queried again.
+# Querying can mean an nvidia-smi subprocess (~100 ms), and the UI and
+# settings helpers ask repeatedly within the same moment.
+GPU_INFO_TTL = 5.0
+
+# Cached query results: key -> (time.monotonic() timestamp, result)
+_gpu_cache: Dict[str, Tuple[float, Dict]] = {}
+
+
+def _cached(key: str, query) -> Dict:
+    """Return a copy of query()'s result, reusing it for GPU_INFO_TTL seconds."""
+    now = time.monotonic()
+    entry = _gpu_cache.get(key)
+    if entry is None or now - entry[0] >= GPU_INFO_TTL:
+        entry = (now, query())
+        _gpu_cache[key] = entry
+    # Callers may modify the dict they get back
+    return dict(entry[1])
+
+
+def _nvml_device():
+    """Return the NVML handle of the first GPU, initializing NVML on first use, or None."""
+    global _nvml_handle
+    if _nvml_handle is None:
+        _nvml_handle = False
+        if NVML_AVAILABLE:
+            try:
+                pynvml.nvmlInit()
+                _nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            except pynvml.NVMLError as e:
+                logger.debug(f"NVML not usable: {e}")
+    return _nvml_handle or None
+
+
+def _as_str(value) -> str:
+    """NVML returns bytes in older pynvml releases and str in newer ones."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def invalidate_gpu_cache():
+    """Forget cached GPU information so the next call queries the GPU again."""
+    _gpu_cache.clear()
+
+
 def get_gpu_info() -> Dict[str, any]:
     """
     Detect GPU information including VRAM availability
 
+    Results are cached for GPU_INFO_TTL seconds (see invalidate_gpu_cache).
+
     Returns:
         dict: {
             'available': bool,
@@ -25,6 +84,11 @@ def get_gpu_info() -> Dict[str, any]:
             'cuda_available': bool,
         }
     """
+    return _cached('gpu_info', _query_gpu_info)
+
+
+def _query_gpu_info() -> Dict[str, any]:
+    """Uncached get_gpu_info."""
     gpu_info = {
         'available': False,
         'name': 'N/A',
@@ -57,11 +121,29 @@ def get_gpu_info() -> Dict[str, any]:
             logger.info(f"VRAM: {gpu_info['vram_total_mb']} MB total, {gpu_info['vram_free_mb']} MB free")
             return gpu_info
     except ImportError:
-        logger.debug("torch not available, trying nvidia-smi")
+        logger.debug("torch not available, trying NVML/nvidia-smi")
     except Exception as e:
         logger.warning(f"Error detecting GPU via torch: {e}")
 
-    # Fallback to nvidia-smi
+    # Then NVML
+    handle = _nvml_device()
+    if handle is not None:
+        try:
+            mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            gpu_info['available'] = True
+            gpu_info['name'] = _as_str(pynvml.nvmlDeviceGetName(handle))
+            gpu_info['vram_total_mb'] = mem.total // (1024 * 1024)
+            gpu_info['vram_free_mb'] = mem.free // (1024 * 1024)
+            gpu_info['vram_used_mb'] = mem.used // (1024 * 1024)
+            gpu_info['driver_version'] = _as_str(pynvml.nvmlSystemGetDriverVersion())
+
+            logger.info(f"GPU detected via NVML: {gpu_info['name']}")
+            logger.info(f"VRAM: {gpu_info['vram_total_mb']} MB total, {gpu_info['vram_free_mb']} MB free")
+            return gpu_info
+        except pynvml.NVMLError as e:
+            logger.warning(f"Error querying GPU via NVML: {e}")
+
+    # Last resort: nvidia-smi
     try:
         result = subprocess.run(
             ['nvidia-smi', '--query-gpu=name,memory.total,memory.free,memory.used,driver_version',
@@ -106,15 +188,20 @@ def get_model_size_mb(model_path: str) -> int:
     Returns:
         Size in MB, or 0 if file not found
     """
+    # One stat call answers existence, file type and size together
     try:
-        path = Path(model_path)
-        if path.exists() and path.is_file():
-            size_mb = path.stat().st_size // (1024 * 1024)
-            logger.debug(f"Model size: {size_mb} MB")
-            return size_mb
+        st = os.stat(model_path)
+    except OSError:
+        return 0
     except Exception as e:
         logger.warning(f"Error getting model size: {e}")
-    return 0
+        return 0
+
+    if not stat.S_ISREG(st.st_mode):
+        return 0
+    size_mb = st.st_size >> 20
+    logger.debug(f"Model size: {size_mb} MB")
+    return size_mb
 
 
 def calculate_optimal_gpu_layers(vram_free_mb: int, model_size_mb: int, safety_margin_mb: int = 2048) -> Tuple[int, str]:
@@ -174,9 +261,16 @@ def get_current_vram_usage() -> Dict[str, int]:
     """
     Get current VRAM usage (useful for monitoring during synthesis)
 
+    Results are cached for GPU_INFO_TTL seconds (see invalidate_gpu_cache).
+
     Returns:
         dict: {'used_mb': int, 'free_mb': int, 'total_mb': int}
     """
+    return _cached('vram_usage', _query_vram_usage)
+
+
+def _query_vram_usage() -> Dict[str, int]:
+    """Uncached get_current_vram_usage."""
     try:
         import torch
         if torch.cuda.is_available():
@@ -192,7 +286,19 @@ def get_current_vram_usage() -> Dict[str, int]:
     except Exception as e:
         logger.debug(f"Could not get VRAM usage via torch: {e}")
 
-    # Fallback to nvidia-smi
+    handle = _nvml_device()
+    if handle is not None:
+        try:
+            mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            return {
+                'used_mb': mem.used // (1024 * 1024),
+                'free_mb': mem.free // (1024 * 1024),
+                'total_mb': mem.total // (1024 * 1024),
+            }
+        except pynvml.NVMLError as e:
+            logger.debug(f"Could not get VRAM usage via NVML: {e}")
+
+    # Last resort: nvidia-smi
     try:
         result = subprocess.run(
             ['nvidia-smi', '--query-gpu=memory.used,memory.free,memory.total',
@@ -5,17 +5,38 @@ Provides incremental FFmpeg streaming for memory-efficient audiobook generation
 with embedded chapter markers and metadata.
 """
 
+import functools
 import os
+import re
 import subprocess
 import logging
+import numpy as np
 from typing import List, Dict, Optional
 from pathlib import Path
 
+# Size of the buffered writer on FFmpeg's stdin; small audio chunks are
+# coalesced into few large pipe writes
+PIPE_BUFFER_SIZE = 1 << 22  # 4 MB
+
+# Native AAC encoder line of `ffmpeg -encoders` (flags column, then name)
+_AAC_ENCODER_RE = re.compile(r"^\s*A\S*\s+aac\s", re.MULTILINE)
+
+# FFMETADATA1 values must backslash-escape '=', ';', '#', newlines and the
+# backslash itself, otherwise FFmpeg misparses (and drops) the entry
+_FFMETADATA_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "=": "\\=",
+    ";": "\\;",
+    "#": "\\#",
+    "\n": "\\\n",
+})
+
 
 def create_m4b_stream(
     output_path: str,
     sample_rate: int = 24000,
     metadata: Optional[Dict[str, str]] = None,
+    chapters_metadata_path: Optional[str] = None,
 ) -> subprocess.Popen:
     """
     Create FFmpeg process for incremental M4B writing via stdin pipe.
@@ -24,13 +45,17 @@ def create_m4b_stream(
         output_path: Path to output M4B file
         sample_rate: Audio sample rate (default: 24000 Hz)
         metadata: Optional metadata dict (title, artist, album, year, genre, composer)
+        chapters_metadata_path: Optional FFMETADATA1 chapter file (see
+            write_chapter_metadata_file) embedded during the encode. Use it
+            when chapter times are known before encoding; it saves the
+            add_chapters_to_m4b remux, which rewrites the whole file.
 
     Returns:
         FFmpeg subprocess.Popen object with stdin available for writing
 
     Example:
         proc = create_m4b_stream("output.m4b", metadata={"title": "My Book"})
-        proc.stdin.write(audio_chunk.astype("float32").tobytes())
+        write_audio_chunk(proc, audio_chunk)
         proc.stdin.close()
         proc.wait()
     """
@@ -43,10 +68,22 @@ def create_m4b_stream(
         "-ar", str(sample_rate),  # Sample rate
         "-ac", "1",  # Mono audio
         "-i", "pipe:0",  # Read from stdin
+    ]
+
+    if chapters_metadata_path:
+        cmd.extend([
+            "-f", "ffmetadata",
+            "-i", chapters_metadata_path,  # Chapter metadata
+            "-map", "0:a",  # Audio from stdin
+            "-map_metadata", "1",  # Metadata from the chapter file
+            "-map_chapters", "1",  # Chapters from the chapter file
+        ])
+
+    cmd.extend([
         "-c:a", "aac",  # AAC codec
         "-q:a", "2",  # Quality level (2 = high quality, ~192 kbps)
         "-movflags", "+faststart+use_metadata_tags",  # Optimize for streaming playback
-    ]
+    ])
 
     # Add metadata if provided
     if metadata:
@@ -62,6 +99,7 @@ def create_m4b_stream(
         proc = subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE,
+            bufsize=PIPE_BUFFER_SIZE,
             stdout=subprocess.DEVNULL,  # Don't capture stdout to avoid buffer issues
             stderr=subprocess.DEVNULL,  # Don't capture stderr to avoid buffer issues
             text=False,  # Binary mode for audio data
@@ -76,6 +114,27 @@ def create_m4b_stream(
         raise RuntimeError(f"Failed to start FFmpeg process: {e}")
 
 
+def write_audio_chunk(proc: subprocess.Popen, chunk: np.ndarray, trailing: bytes = b"") -> None:
+    """
+    Write an audio chunk to an FFmpeg stream process as f32le samples.
+
+    The array's buffer is handed to the pipe directly; float32 C-contiguous
+    audio (what the TTS produces) is written without any copy, unlike
+    astype("float32").tobytes() which copies it twice.
+
+    Args:
+        proc: Process from create_m4b_stream or create_opus_stream
+        chunk: Audio samples
+        trailing: Raw f32le bytes (e.g. a silence gap) written after the
+                  chunk in the same call
+    """
+    data = np.ascontiguousarray(chunk, dtype="<f4").data
+    if trailing:
+        proc.stdin.writelines((data, trailing))
+    else:
+        proc.stdin.write(data)
+
+
 def write_chapter_metadata_file(
     chapters: List[Dict[str, any]],
     metadata_path: str,
@@ -98,22 +157,26 @@ def write_chapter_metadata_file(
     """
     logging.info(f"Writing chapter metadata to {metadata_path}")
 
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        f.write(";FFMETADATA1\n")
-
-        for chapter in chapters:
-            chapter_name = chapter["chapter"]
-            start_ms = int(chapter["start"] * 1000)
-            end_ms = int(chapter["end"] * 1000)
-
-            # Escape special characters in chapter title
-            safe_title = chapter_name.replace("=", "\\=")
+    # Convert all chapter times to whole milliseconds at once (truncating,
+    # like int()); tolist() gives back plain ints for formatting
+    count = len(chapters)
+    starts = np.fromiter((c["start"] for c in chapters), dtype=np.float64, count=count)
+    ends = np.fromiter((c["end"] for c in chapters), dtype=np.float64, count=count)
+    starts_ms = (starts * 1000).astype(np.int64).tolist()
+    ends_ms = (ends * 1000).astype(np.int64).tolist()
+
+    # Build the whole file in memory and write it at once
+    parts = [";FFMETADATA1\n"]
+    for chapter, start_ms, end_ms in zip(chapters, starts_ms, ends_ms):
+        # Escape special characters in chapter title
+        safe_title = chapter["chapter"].translate(_FFMETADATA_ESCAPES)
+
+        parts.append(
+            f"\n[CHAPTER]\nTIMEBASE=1/1000\nSTART={start_ms}\nEND={end_ms}\ntitle={safe_title}\n"
+        )
 
-            f.write(f"\n[CHAPTER]\n")
-            f.write(f"TIMEBASE=1/1000\n")
-            f.write(f"START={start_ms}\n")
-            f.write(f"END={end_ms}\n")
-            f.write(f"title={safe_title}\n")
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
     logging.info(f"Wrote {len(chapters)} chapters to metadata file")
 
@@ -283,8 +346,9 @@ def create_opus_stream(
         proc = subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            bufsize=PIPE_BUFFER_SIZE,
+            stdout=subprocess.DEVNULL,  # Nothing reads these pipes; a full pipe
+            stderr=subprocess.DEVNULL,  # would stall FFmpeg mid-encode
             text=False,
         )
         return proc
@@ -294,10 +358,14 @@ def create_opus_stream(
         raise RuntimeError(f"Failed to start Opus stream: {e}")
 
 
+@functools.lru_cache(maxsize=1)
 def verify_ffmpeg_available() -> tuple[bool, str]:
     """
     Verify FFmpeg is installed and has AAC codec support.
 
+    The result is cached for the lifetime of the process; call
+    verify_ffmpeg_available.cache_clear() to probe again.
+
     Returns:
         Tuple of (is_available, message)
     """
@@ -313,16 +381,17 @@ def verify_ffmpeg_available() -> tuple[bool, str]:
         if result.returncode != 0:
             return False, "FFmpeg command failed"
 
-        # Check for AAC codec
+        # Check for the AAC encoder; -encoders is much shorter than -codecs and
+        # does not count decode-only entries
         codec_result = subprocess.run(
-            ["ffmpeg", "-codecs"],
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-encoders"],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             timeout=5,
         )
 
-        if "aac" not in codec_result.stdout.lower():
+        if not _AAC_ENCODER_RE.search(codec_result.stdout):
             return False, "FFmpeg found but AAC codec not available"
 
         return True, "FFmpeg with AAC codec is available"
@@ -9,3 +9,4 @@ CODE_TOKEN_OFFSET = 128266
 SNAC_MIN_ID = 128266
 SNAC_MAX_ID = 156937
 SNAC_TOKENS_PER_FRAME = 7
+SAMPLE_RATE = 24000  # SNAC 24 kHz decoder output, mono
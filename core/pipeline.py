@@ -1,32 +1,70 @@
 # core/pipeline.py
-import queue
-import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import sys
 import os
 import numpy as np
 import soundfile as sf
 from datetime import datetime
-from typing import List, Tuple, Dict, Optional
-from .chunking import chunk_text
-from .tts_maya1_hf import synthesize_chunk_hf
-from .audio_combine import concat_wavs
+from typing import List, Tuple, Dict, Optional, Iterator
+from .chunking import chunk_text, make_chunker
+from .maya1_constants import SAMPLE_RATE
+from .tts_maya1_hf import synthesize_chunk_hf, load_models
+from .chunk_cache import synthesize_chunk_cached
 from .video_export import export_mp4
-from .m4b_export import create_m4b_stream, write_chapter_metadata_file, add_chapters_to_m4b
+from .m4b_export import create_m4b_stream, write_audio_chunk, write_chapter_metadata_file, add_chapters_to_m4b
 from .utils import sanitize_name_for_os, sanitize_chapter_name, find_unique_path, clean_text
 
-# Configure logging
-log_filename = f"mayabook_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Log file of this session, created on the first pipeline run
+log_filename = None
+
+
+def _init_logging():
+    """
+    Configure logging the first time a pipeline runs.
+
+    Done lazily so importing this module (as the GUIs do at startup) doesn't
+    create an empty log file, and only once so handlers are never registered
+    twice. Set MAYABOOK_LOG_STDOUT=0 to log to the file only, which keeps
+    per-chunk records off the console during long runs.
+    """
+    global log_filename
+    if log_filename is not None:
+        return
+
+    log_filename = f"mayabook_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    handlers = [logging.FileHandler(log_filename)]
+    if os.environ.get("MAYABOOK_LOG_STDOUT", "1") != "0":
+        handlers.append(logging.StreamHandler(sys.stdout))
+
+    # Added next to any handlers the application installed (e.g. the web UI
+    # log view), whose level is left alone
+    root = logging.getLogger()
+    if not root.handlers:
+        root.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+def _never_stopped() -> bool:
+    return False
+
+
+def _stop_checker(stop_flag):
+    """
+    Return a no-argument callable telling whether a stop was requested.
+
+    Resolved once per run, so the per-chunk checks are a single bound-method
+    call instead of re-testing stop_flag for None every time.
+    """
+    return stop_flag.is_set if stop_flag is not None else _never_stopped
+
+
 def run_pipeline(
     epub_text: str,
     model_path: str,
@@ -42,12 +80,17 @@ def run_pipeline(
     max_tokens: int = 2500,
     progress_cb=None,
     stop_flag=None,
+    use_chunk_cache: bool = False,
 ):
     """
     Runs the full text-to-video pipeline.
 
-    HF full-precision path only.
+    HF full-precision path only. With use_chunk_cache, chunks already
+    synthesized with the same text, voice, model and sampling parameters
+    are taken from the chunk cache (see core.chunk_cache).
     """
+    _init_logging()
+
     logger.info("="*60)
     logger.info("Starting MayaBook pipeline")
     logger.info(f"Model path: {model_path}")
@@ -75,80 +118,60 @@ def run_pipeline(
     except Exception as e:
         logger.error(f"Error chunking text: {e}", exc_info=True)
         raise
-    q = queue.Queue()
-    for i, t in enumerate(chunks):
-        q.put((i, t))
-
-    results = {}
-    lock = threading.Lock()
-    exceptions = []
-
-    def worker():
-        while True:
-            if stop_flag and stop_flag.is_set():
-                logger.info("Worker stopping due to stop flag")
-                return
 
-            try:
-                i, t = q.get_nowait()
-            except queue.Empty:
-                logger.debug("Worker finished - queue empty")
-                return
+    if not chunks:
+        raise ValueError("No text to synthesize.")
 
-            try:
-                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                logger.debug(f"Chunk {i} text preview: {t[:100]}...")
-
-                wav_path = synthesize_chunk_hf(
-                    model_path=model_path,
-                    text=t,
-                    voice_description=voice_desc,
-                    temperature=temperature,
-                    top_p=top_p,
-                    max_tokens=max_tokens,
-                )
-
-                logger.info(f"Chunk {i+1} synthesized successfully: {wav_path}")
-
-                with lock:
-                    results[i] = wav_path
-
-                if progress_cb:
-                    progress_cb(len(results), len(chunks))
-            except Exception as e:
-                logger.error(f"Error processing chunk {i}: {e}", exc_info=True)
-                with lock:
-                    exceptions.append(e)
-            finally:
-                q.task_done()
-
-    logger.info(f"Starting {workers} worker threads")
-    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
-    for th in threads:
-        th.start()
-
-    logger.info("Waiting for all chunks to complete...")
-    q.join()
-
-    if exceptions:
-        logger.error(f"Pipeline failed with {len(exceptions)} exception(s)")
-        raise exceptions[0]
-
-    if stop_flag and stop_flag.is_set():
-        logger.info("Pipeline stopped by user")
-        return None, None
+    stop_requested = _stop_checker(stop_flag)
+    gap_silence = np.zeros(int(gap_s * SAMPLE_RATE), dtype="float32") if gap_s > 0 else None
 
-    logger.info("All chunks processed successfully")
-    ordered_wavs = [results[i] for i in sorted(results.keys())]
+    # Chunk audio is written to the output straight from memory as it is
+    # synthesized, with no temporary WAV per chunk. It goes to a temporary file
+    # next to out_wav that only replaces it once every chunk succeeded.
+    os.makedirs(os.path.dirname(os.path.abspath(out_wav)), exist_ok=True)
+    tmp_path = f"{out_wav}.part"
 
-    logger.info(f"Concatenating {len(ordered_wavs)} audio files...")
     try:
-        final_wav_path = concat_wavs(ordered_wavs, out_wav, gap_seconds=gap_s)
-        logger.info(f"Final audio saved: {final_wav_path}")
-    except Exception as e:
-        logger.error(f"Error concatenating audio: {e}", exc_info=True)
+        chunk_results = _process_chunks_parallel(
+            chunks=chunks,
+            model_path=model_path,
+            voice_desc=voice_desc,
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            workers=workers,
+            stop_flag=stop_flag,
+            progress_cb=progress_cb,
+            return_array=True,
+            use_chunk_cache=use_chunk_cache,
+        )
+
+        total_samples = 0
+        with sf.SoundFile(tmp_path, "w", samplerate=SAMPLE_RATE, channels=1, format="WAV") as out_file:
+            for i, audio in enumerate(chunk_results):
+                if i and gap_silence is not None:
+                    out_file.write(gap_silence)
+                    total_samples += len(gap_silence)
+                out_file.write(audio)
+                total_samples += len(audio)
+
+        if stop_requested():
+            logger.info("Pipeline stopped by user")
+            os.remove(tmp_path)
+            return None, None
+
+        os.replace(tmp_path, out_wav)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         raise
 
+    final_wav_path = out_wav
+    logger.info("All chunks processed successfully")
+    logger.info(f"Final audio saved: {final_wav_path} ({total_samples / SAMPLE_RATE:.2f}s)")
+
     logger.info("="*60)
     logger.info("Pipeline completed successfully!")
     logger.info(f"Log file: {log_filename}")
@@ -176,6 +199,7 @@ def run_pipeline_with_chapters(
     max_tokens: int = 2500,
     progress_cb=None,
     stop_flag=None,
+    use_chunk_cache: bool = False,
 ) -> Dict[str, any]:
     """
     Runs the full text-to-audio pipeline with chapter support.
@@ -199,6 +223,7 @@ def run_pipeline_with_chapters(
         max_tokens: Max tokens per generation
         progress_cb: Progress callback function(current, total, chapter_info)
         stop_flag: Threading event to stop processing
+        use_chunk_cache: Reuse cached audio for previously synthesized chunks
 
     Returns:
         Dictionary with:
@@ -207,6 +232,8 @@ def run_pipeline_with_chapters(
             - 'chapter_times': List of chapter timing dicts
             - 'metadata': Metadata dictionary used
     """
+    _init_logging()
+
     logger.info("="*60)
     logger.info("Starting MayaBook pipeline (Chapter-Aware Mode)")
     logger.info(f"Chapters: {len(chapters)}")
@@ -237,10 +264,20 @@ def run_pipeline_with_chapters(
         os.makedirs(chapters_out_dir, exist_ok=True)
         logger.info(f"Chapter output folder: {chapters_out_dir}")
 
+        # Chapter file names only depend on the titles, so build them up front
+        chapter_out_paths = [
+            os.path.join(chapters_out_dir, f"{idx:02d}_{sanitize_chapter_name(title)}.wav")
+            for idx, (title, _) in enumerate(chapters, 1)
+        ]
+
     # Initialize chapter timing tracking
     chapter_times = []
-    current_time = 0.0
-    sample_rate = 24000
+    # Position in the merged audio, counted in samples so chapter marks
+    # don't drift the way summed float durations do over a long book
+    current_samples = 0
+    # Chunk audio arrives as bare arrays, all at the synthesizer's rate
+    sample_rate = SAMPLE_RATE
+    stop_requested = _stop_checker(stop_flag)
 
     # Prepare merged output file/stream if needed
     merged_file = None
@@ -270,29 +307,41 @@ def run_pipeline_with_chapters(
     total_chunks = 0
     processed_chunks = 0
 
+    # Silence buffers are built once and shared by every write (sinks only
+    # read them); the FFmpeg pipe gets their raw bytes
+    gap_silence = np.zeros(int(gap_s * sample_rate), dtype="float32") if gap_s > 0 else None
+    gap_silence_bytes = gap_silence.tobytes() if gap_silence is not None else b""
+    chapter_silence_buf = np.zeros(int(chapter_silence * sample_rate), dtype="float32")
+    chapter_silence_bytes = chapter_silence_buf.tobytes() if ffmpeg_proc else b""
+
+    # Every chapter is chunked with the same limits, so bind them once.
+    # chunk_size is interpreted as max_words when < 500, otherwise max_chars
+    if chunk_size < 500:
+        chunker = make_chunker(max_words=chunk_size)
+        chunk_limit_desc = f"{chunk_size} words max"
+    else:
+        chunker = make_chunker(max_chars=chunk_size)
+        chunk_limit_desc = f"{chunk_size} chars max"
+
     try:
         # Process each chapter
         for chapter_idx, (chapter_title, chapter_text) in enumerate(chapters, 1):
-            if stop_flag and stop_flag.is_set():
+            if stop_requested():
                 logger.info("Pipeline stopped by user")
                 break
 
             logger.info(f"\nProcessing Chapter {chapter_idx}/{len(chapters)}: {chapter_title}")
 
             # Track chapter start time
-            chapter_start_time = current_time
+            chapter_start_samples = current_samples
 
             # Clean and annotate chapter text
             cleaned_text = clean_text(chapter_text)
             annotated_text = f"<<CHAPTER: {chapter_title}>>\n\n{cleaned_text}"
 
             # Chunk the chapter text
-            if chunk_size < 500:
-                chapter_chunks = chunk_text(annotated_text, max_words=chunk_size)
-                logger.info(f"  Chapter chunked into {len(chapter_chunks)} parts ({chunk_size} words max)")
-            else:
-                chapter_chunks = chunk_text(annotated_text, max_chars=chunk_size)
-                logger.info(f"  Chapter chunked into {len(chapter_chunks)} parts ({chunk_size} chars max)")
+            chapter_chunks = chunker(annotated_text)
+            logger.info(f"  Chapter chunked into {len(chapter_chunks)} parts ({chunk_limit_desc})")
 
             total_chunks += len(chapter_chunks)
 
@@ -300,9 +349,7 @@ def run_pipeline_with_chapters(
             chapter_file = None
             chapter_path = None
             if save_chapters_separately:
-                sanitized_title = sanitize_chapter_name(chapter_title)
-                chapter_filename = f"{chapter_idx:02d}_{sanitized_title}.wav"
-                chapter_path = os.path.join(chapters_out_dir, chapter_filename)
+                chapter_path = chapter_out_paths[chapter_idx - 1]
                 chapter_file = sf.SoundFile(chapter_path, "w", samplerate=sample_rate, channels=1, format="WAV")
                 logger.info(f"  Opened chapter file: {chapter_path}")
 
@@ -320,27 +367,24 @@ def run_pipeline_with_chapters(
                     processed_chunks + curr,
                     total_chunks,
                     f"Chapter {chapter_idx}/{len(chapters)}: {chapter_title}"
-                ) if progress_cb else None
+                ) if progress_cb else None,
+                # Audio goes straight from the synthesizer to the outputs,
+                # without a temporary WAV round trip per chunk
+                return_array=True,
+                use_chunk_cache=use_chunk_cache,
             )
 
-            if stop_flag and stop_flag.is_set():
-                if chapter_file:
-                    chapter_file.close()
-                break
-
-            # Write chapter audio incrementally
-            for chunk_wav_path in chunk_results:
-                # Read chunk audio
-                audio, sr = sf.read(chunk_wav_path, dtype="float32", always_2d=False)
-                chunk_duration = len(audio) / sr
-
+            # Write chapter audio incrementally, as each chunk is synthesized
+            for audio in chunk_results:
                 # Write to merged file
                 if merge_chapters:
                     if merged_file:
                         merged_file.write(audio)
                     elif ffmpeg_proc:
-                        audio_bytes = audio.astype("float32").tobytes()
-                        ffmpeg_proc.stdin.write(audio_bytes)
+                        # Already float32 from the synthesizer, so the f32le
+                        # pipe takes its buffer as is; the chunk gap goes out
+                        # in the same call
+                        write_audio_chunk(ffmpeg_proc, audio, trailing=gap_silence_bytes)
 
                 # Write to chapter file
                 if chapter_file:
@@ -348,18 +392,20 @@ def run_pipeline_with_chapters(
 
                 # Add chunk gap
                 if gap_s > 0:
-                    silence = np.zeros(int(gap_s * sample_rate), dtype="float32")
                     if merge_chapters:
                         if merged_file:
-                            merged_file.write(silence)
-                        elif ffmpeg_proc:
-                            ffmpeg_proc.stdin.write(silence.tobytes())
+                            merged_file.write(gap_silence)
                     if chapter_file:
-                        chapter_file.write(silence)
+                        chapter_file.write(gap_silence)
+
+                    current_samples += len(gap_silence)
 
-                    current_time += gap_s
+                current_samples += len(audio)
 
-                current_time += chunk_duration
+            if stop_requested():
+                if chapter_file:
+                    chapter_file.close()
+                break
 
             processed_chunks += len(chapter_chunks)
 
@@ -372,21 +418,18 @@ def run_pipeline_with_chapters(
             # Track chapter timing
             chapter_times.append({
                 "chapter": chapter_title,
-                "start": chapter_start_time,
-                "end": current_time
+                "start": chapter_start_samples / sample_rate,
+                "end": current_samples / sample_rate
             })
 
             # Add silence between chapters (except after last)
             if chapter_idx < len(chapters) and merge_chapters:
-                silence_samples = int(chapter_silence * sample_rate)
-                silence = np.zeros(silence_samples, dtype="float32")
-
                 if merged_file:
-                    merged_file.write(silence)
+                    merged_file.write(chapter_silence_buf)
                 elif ffmpeg_proc:
-                    ffmpeg_proc.stdin.write(silence.tobytes())
+                    ffmpeg_proc.stdin.write(chapter_silence_bytes)
 
-                current_time += chapter_silence
+                current_samples += len(chapter_silence_buf)
                 logger.info(f"  Added {chapter_silence}s silence after chapter")
 
         # Finalize merged output
@@ -445,7 +488,7 @@ def run_pipeline_with_chapters(
         if merged_file and not merged_file.closed:
             merged_file.close()
 
-    if stop_flag and stop_flag.is_set():
+    if stop_requested():
         logger.info("Pipeline stopped by user")
         return {
             "merged_path": None,
@@ -479,63 +522,76 @@ def _process_chunks_parallel(
     workers: int,
     stop_flag,
     progress_cb=None,
-) -> List[str]:
+    return_array: bool = False,
+    use_chunk_cache: bool = False,
+) -> Iterator:
     """
     Process chunks in parallel using worker threads.
 
-    Returns:
-        List of WAV file paths in order
-    """
-    q = queue.Queue()
-    for i, text in enumerate(chunks):
-        q.put((i, text))
-
-    results = {}
-    lock = threading.Lock()
-    exceptions = []
-
-    def worker():
-        while True:
-            if stop_flag and stop_flag.is_set():
-                return
-
-            try:
-                i, text = q.get_nowait()
-            except queue.Empty:
-                return
+    This is a generator: each chunk's result is yielded, in order, as soon as
+    it and every chunk before it are done, so the caller can write audio
+    while the workers are still synthesizing the rest of the chunks.
 
-            try:
-                logger.debug(f"Processing chunk {i+1}/{len(chunks)}: {text[:50]}...")
-
-                wav_path = synthesize_chunk_hf(
-                    model_path=model_path,
-                    text=text,
-                    voice_description=voice_desc,
-                    temperature=temperature,
-                    top_p=top_p,
-                    max_tokens=max_tokens,
-                )
-
-                with lock:
-                    results[i] = wav_path
-
-                if progress_cb:
-                    progress_cb(len(results), len(chunks))
-
-            except Exception as e:
-                logger.error(f"Error processing chunk {i}: {e}", exc_info=True)
-                with lock:
-                    exceptions.append(e)
-            finally:
-                q.task_done()
+    Args:
+        return_array: Keep each chunk's audio in memory as a float32 array
+                      instead of a temporary WAV file
+        use_chunk_cache: Look chunks up in (and add them to) the chunk cache
 
-    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
-    for th in threads:
-        th.start()
+    Yields:
+        WAV file paths (or audio arrays) in chunk order. Stops early once
+        stop_flag is set.
+    """
+    completed = itertools.count(1)
+    synthesize = synthesize_chunk_cached if use_chunk_cache else synthesize_chunk_hf
+    stop_requested = _stop_checker(stop_flag)
 
-    q.join()
+    def synthesize_one(i, text):
+        if stop_requested():
+            return None
 
-    if exceptions:
-        raise exceptions[0]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing chunk %d/%d: %s...", i + 1, len(chunks), text[:50])
 
-    return [results[i] for i in sorted(results.keys())]
+        try:
+            result = synthesize(
+                model_path=model_path,
+                text=text,
+                voice_description=voice_desc,
+                temperature=temperature,
+                top_p=top_p,
+                max_tokens=max_tokens,
+                return_array=return_array,
+            )
+        except Exception as e:
+            logger.error(f"Error processing chunk {i}: {e}", exc_info=True)
+            raise
+
+        # count() increments are atomic under the GIL, so no lock
+        done = next(completed)
+        if progress_cb:
+            progress_cb(done, len(chunks))
+
+        return result
+
+    # Load the model once up front; every worker shares the warm instance.
+    # With the chunk cache it is left to the first cache miss instead
+    # (synthesize_chunk_hf loads it under a lock), so a fully cached run
+    # never loads the model at all.
+    if not use_chunk_cache:
+        load_models(model_path)
+
+    # The executor works through the chunks in submission order; waiting on
+    # the futures in that same order hands results back strictly in order
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-worker")
+    try:
+        futures = [executor.submit(synthesize_one, i, text) for i, text in enumerate(chunks)]
+        for future in futures:
+            result = future.result()
+            if result is None:
+                # Stopped by the user
+                return
+            yield result
+    finally:
+        # On stop, error or an abandoned generator, drop the chunks that have
+        # not started yet and wait for the ones in flight
+        executor.shutdown(wait=True, cancel_futures=True)
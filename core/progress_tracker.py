@@ -6,11 +6,22 @@ import time
 import logging
 from typing import Optional, Dict, List
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 
+def _format_duration(total_seconds: int) -> str:
+    """Format a duration as "1h 2m 3s", "2m 3s" or "3s" """
+    if total_seconds < 60:
+        return f"{total_seconds}s"
+    if total_seconds < 3600:
+        minutes, seconds = divmod(total_seconds, 60)
+        return f"{minutes}m {seconds}s"
+    hours, rem = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"{hours}h {minutes}m {seconds}s"
+
+
 @dataclass
 class ChunkProgress:
     """Progress information for a single chunk"""
@@ -84,35 +95,11 @@ class ProgressStats:
         if self.eta_seconds <= 0:
             return "Calculating..."
 
-        eta = timedelta(seconds=int(self.eta_seconds))
-
-        # Format based on duration
-        hours = eta.seconds // 3600
-        minutes = (eta.seconds % 3600) // 60
-        seconds = eta.seconds % 60
-
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
+        return _format_duration(int(self.eta_seconds))
 
     def get_elapsed_string(self) -> str:
         """Get elapsed time as human-readable string"""
-        elapsed = time.time() - self.start_time
-        elapsed_delta = timedelta(seconds=int(elapsed))
-
-        hours = elapsed_delta.seconds // 3600
-        minutes = (elapsed_delta.seconds % 3600) // 60
-        seconds = elapsed_delta.seconds % 60
-
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
+        return _format_duration(int(time.time() - self.start_time))
 
     def get_speed_string(self) -> str:
         """Get synthesis speed as human-readable string"""
@@ -153,6 +140,8 @@ class ProgressTracker:
             total_chars=total_chars
         )
         self.chunks: List[ChunkProgress] = []
+        # First chunk started with each index, for O(1) lookup on completion
+        self._chunks_by_index: Dict[int, ChunkProgress] = {}
         self.callbacks: List[callable] = []
 
     def add_callback(self, callback: callable):
@@ -169,6 +158,7 @@ class ProgressTracker:
             word_count=len(text.split())
         )
         self.chunks.append(chunk)
+        self._chunks_by_index.setdefault(index, chunk)
 
         self.stats.current_chunk_index = index
         self.stats.current_chunk_text = text
@@ -179,7 +169,7 @@ class ProgressTracker:
     def complete_chunk(self, index: int, audio_path: str, success: bool = True, error: Optional[str] = None):
         """Mark chunk as completed"""
         # Find chunk
-        chunk = next((c for c in self.chunks if c.index == index), None)
+        chunk = self._chunks_by_index.get(index)
         if chunk:
             chunk.end_time = time.time()
             chunk.success = success
@@ -200,6 +190,10 @@ class ProgressTracker:
 
     def _notify_callbacks(self):
         """Notify all registered callbacks"""
+        # Building the summary formats several strings; skip it when unused
+        if not self.callbacks:
+            return
+
         summary = self.stats.get_summary_dict()
         for callback in self.callbacks:
             try:
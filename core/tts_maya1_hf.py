@@ -1,17 +1,21 @@
 # core/tts_maya1_hf.py
 """HuggingFace Transformers implementation for Maya1 TTS (full precision only)."""
+import functools
+import os
 import tempfile
+import threading
+import numpy as np
 import torch
 import soundfile as sf
 import logging
 from dataclasses import dataclass
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, LogitsProcessor, LogitsProcessorList
 
 from snac import SNAC
 from .maya1_constants import (
     SOH_ID, EOH_ID, SOA_ID, TEXT_EOT_ID,
     CODE_START_TOKEN_ID, CODE_END_TOKEN_ID, CODE_TOKEN_OFFSET,
-    SNAC_MIN_ID, SNAC_MAX_ID, SNAC_TOKENS_PER_FRAME,
+    SNAC_MIN_ID, SNAC_MAX_ID, SNAC_TOKENS_PER_FRAME, SAMPLE_RATE,
 )
 
 logger = logging.getLogger(__name__)
@@ -21,6 +25,14 @@ _tokenizer = None
 _snac = None
 _model_key: str | None = None
 _tokenizer_path: str | None = None
+# Serializes loading so concurrent workers never load the model twice
+_load_lock = threading.Lock()
+
+# Opt-in (MAYABOOK_TORCH_COMPILE=1, CUDA only): generate with a static KV
+# cache and a torch.compile'd forward so CUDA graphs replace the per-token
+# Python and kernel-launch overhead. Compiling makes loading much slower, and
+# the static cache lives on the shared model, so use it with a single worker.
+TORCH_COMPILE_ENABLED = os.environ.get("MAYABOOK_TORCH_COMPILE", "0") == "1"
 
 def _choose_full_dtype() -> torch.dtype:
     """Select best dtype for full-precision load."""
@@ -31,8 +43,26 @@ def _choose_full_dtype() -> torch.dtype:
         return torch.float16
     return torch.float32
 
+def load_models(model_path: str) -> None:
+    """
+    Load (warm up) the model, tokenizer and SNAC codec ahead of synthesis.
+
+    Models are cached at module level and shared by all worker threads, so
+    this only does work the first time (or when model_path changes).
+    """
+    _ensure_models(model_path)
+
 def _ensure_models(model_path: str):
     """Load HuggingFace model, tokenizer, and SNAC codec"""
+    # Fast path: already loaded; no lock needed to read the cached references
+    if _model is not None and _model_key == model_path and _tokenizer_path == model_path and _snac is not None:
+        return _model, _tokenizer, _snac
+
+    with _load_lock:
+        return _load_models_locked(model_path)
+
+def _load_models_locked(model_path: str):
+    """_ensure_models body; caller holds _load_lock."""
     global _model, _tokenizer, _snac, _model_key, _tokenizer_path
 
     requested_key = model_path
@@ -66,6 +96,9 @@ def _ensure_models(model_path: str):
 
         _model.eval()
 
+        if TORCH_COMPILE_ENABLED and torch.cuda.is_available():
+            _compile_for_static_generation(_model)
+
     if _tokenizer is None or _tokenizer_path != model_path:
         logger.info("Loading tokenizer...")
         _tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
@@ -85,6 +118,30 @@ def _ensure_models(model_path: str):
 
     return _model, _tokenizer, _snac
 
+def _compile_for_static_generation(model) -> None:
+    """
+    Switch generation to a static KV cache and compile the forward pass.
+
+    Runs one short warm-up generation so compilation happens at load time
+    rather than on the first chunk. Falls back to eager generation if
+    compiling fails.
+    """
+    logger.info("Compiling model for static-cache generation (MAYABOOK_TORCH_COMPILE=1)...")
+    eager_forward = model.forward
+    try:
+        model.generation_config.cache_implementation = "static"
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+
+        device = next(model.parameters()).device
+        warmup_ids = torch.tensor([[SOH_ID, TEXT_EOT_ID, EOH_ID, SOA_ID, CODE_START_TOKEN_ID]], device=device)
+        with torch.inference_mode():
+            model.generate(warmup_ids, max_new_tokens=4, do_sample=False, pad_token_id=CODE_END_TOKEN_ID)
+        logger.info("Model compiled")
+    except Exception as e:
+        logger.warning(f"torch.compile failed, using eager generation: {e}")
+        model.forward = eager_forward
+        model.generation_config.cache_implementation = None
+
 def _build_prompt(description: str, text: str) -> str:
     """
     Build prompt for Maya1 HF model
@@ -93,28 +150,75 @@ def _build_prompt(description: str, text: str) -> str:
     # HF model should handle emotion tags correctly, so we keep them
     return f'<description="{description.strip()}"> {text.strip()}'
 
+@functools.lru_cache(maxsize=8)
+def _encode_prompt_prefix(tokenizer, description: str) -> tuple[int, ...]:
+    """
+    Token IDs framing every prompt for a voice, up to the chunk text.
+
+    The voice description is the same for every chunk of a book, so it is
+    tokenized once. The prompt is split at the space before the text, which
+    the Llama-3 pre-tokenizer always treats as a word boundary, so prefix
+    plus text tokens equal the tokens of the whole _build_prompt() string.
+    """
+    description_tokens = tokenizer.encode(f'<description="{description.strip()}">', add_special_tokens=False)
+    return (SOH_ID, tokenizer.bos_token_id, *description_tokens)
+
+# Closes every prompt, after the chunk text
+_PROMPT_SUFFIX = (TEXT_EOT_ID, EOH_ID, SOA_ID, CODE_START_TOKEN_ID)
+
+class SnacOnlyLogitsProcessor(LogitsProcessor):
+    """
+    Restrict sampling to SNAC audio tokens and CODE_END.
+
+    Generation starts right after CODE_START, so every token the model should
+    produce is a SNAC code or the end marker; anything else would be dropped
+    by _prepare_snac_frames anyway. Masking the rest keeps that probability
+    mass on audio tokens. The boolean mask is built once per device and
+    vocabulary size.
+    """
+
+    def __init__(self):
+        self._masks = {}
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        key = (scores.device, scores.shape[-1])
+        disallowed = self._masks.get(key)
+        if disallowed is None:
+            disallowed = torch.ones(scores.shape[-1], dtype=torch.bool, device=scores.device)
+            disallowed[SNAC_MIN_ID:SNAC_MAX_ID + 1] = False
+            disallowed[CODE_END_TOKEN_ID] = False
+            self._masks[key] = disallowed
+        return scores.masked_fill(disallowed, float("-inf"))
+
+# Shared by all chunks (and worker threads); it only caches its masks
+_SNAC_LOGITS_PROCESSORS = LogitsProcessorList([SnacOnlyLogitsProcessor()])
+
 def _extract_snac_ids(token_ids: list[int]) -> list[int]:
     """Extract SNAC audio tokens from generated token IDs"""
-    return _prepare_snac_frames(token_ids).snac_ids
+    return _prepare_snac_frames(token_ids).snac_ids.tolist()
 
 @dataclass
 class SnacFramePreparation:
-    snac_ids: list[int]
+    snac_ids: np.ndarray  # int64
     code_end_index: int | None
     residual_before_padding: int
     padded_tokens: int
     discarded_tokens: int
 
-def _prepare_snac_frames(gen_ids: list[int]) -> SnacFramePreparation:
+def _prepare_snac_frames(gen_ids) -> SnacFramePreparation:
     """
     Extract SNAC tokens, detect early CODE_END, and pad partial frames.
+
+    Works on the whole token sequence with NumPy comparisons rather than
+    per-token Python loops; gen_ids may be a list or an integer array.
     """
-    try:
-        start_idx = gen_ids.index(CODE_START_TOKEN_ID) + 1
-    except ValueError:
-        start_idx = 0
+    gen_ids = np.asarray(gen_ids, dtype=np.int64)
+
+    starts = np.flatnonzero(gen_ids == CODE_START_TOKEN_ID)
+    start_idx = int(starts[0]) + 1 if starts.size else 0
 
-    code_end_index = next((i for i, t in enumerate(gen_ids[start_idx:], start=start_idx) if t == CODE_END_TOKEN_ID), None)
+    ends = np.flatnonzero(gen_ids[start_idx:] == CODE_END_TOKEN_ID)
+    code_end_index = start_idx + int(ends[0]) if ends.size else None
     if code_end_index is not None:
         logger.info(
             "CODE_END_TOKEN_ID encountered at generated index %d", code_end_index
@@ -123,7 +227,8 @@ def _prepare_snac_frames(gen_ids: list[int]) -> SnacFramePreparation:
         logger.info("CODE_END_TOKEN_ID not found in generated tokens")
 
     cutoff = code_end_index if code_end_index is not None else len(gen_ids)
-    snac_candidates = [t for t in gen_ids[start_idx:cutoff] if SNAC_MIN_ID <= t <= SNAC_MAX_ID]
+    segment = gen_ids[start_idx:cutoff]
+    snac_candidates = segment[(segment >= SNAC_MIN_ID) & (segment <= SNAC_MAX_ID)]
 
     residual = len(snac_candidates) % SNAC_TOKENS_PER_FRAME
     padded_tokens = 0
@@ -138,9 +243,9 @@ def _prepare_snac_frames(gen_ids: list[int]) -> SnacFramePreparation:
             logger.warning(
                 "CODE_END_TOKEN_ID arrived before completing a full SNAC frame; padding final frame"
             )
-        if snac_candidates:
+        if snac_candidates.size:
             padded_tokens = SNAC_TOKENS_PER_FRAME - residual
-            snac_candidates.extend([snac_candidates[-1]] * padded_tokens)
+            snac_candidates = np.pad(snac_candidates, (0, padded_tokens), mode="edge")
             logger.info(
                 "Padded final SNAC frame with %d token(s) using last available token",
                 padded_tokens,
@@ -156,6 +261,9 @@ def _prepare_snac_frames(gen_ids: list[int]) -> SnacFramePreparation:
         discarded_tokens=discarded_tokens,
     )
 
+# Fade-in ramps by length; almost every chunk uses the default 320 samples
+_RAMP_CACHE: dict[int, np.ndarray] = {}
+
 def _apply_fade_and_trim(audio, trim_samples: int | None = 512, fade_samples: int = 320):
     """
     Soft-trim initial codec warmup and fade edges to avoid clicks when concatenating chunks.
@@ -165,35 +273,31 @@ def _apply_fade_and_trim(audio, trim_samples: int | None = 512, fade_samples: in
 
     fade = min(fade_samples, len(audio) // 4)
     if fade > 0:
-        ramp = torch.linspace(0.0, 1.0, fade, device="cpu", dtype=torch.float32).numpy()
+        ramp = _RAMP_CACHE.get(fade)
+        if ramp is None:
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+            ramp.flags.writeable = False
+            _RAMP_CACHE[fade] = ramp
         audio[:fade] *= ramp
         audio[-fade:] *= ramp[::-1]
     return audio
 
-def _unpack_snac_from_7(snac_ids: list[int]):
+def _unpack_snac_from_7(snac_ids):
     """
     Unpack 7-token SNAC frames into 3-level hierarchical codes.
     Frame structure: [L1, L2a, L3a, L3b, L2b, L3c, L3d]
+
+    Returns contiguous int64 arrays, gathered from the frames reshaped to one
+    row each; the codebooks have 4096 entries, so the modulo is a mask.
     """
+    snac_ids = np.asarray(snac_ids, dtype=np.int64)
     frames = len(snac_ids) // SNAC_TOKENS_PER_FRAME
 
-    if frames == 0:
-        return [[], [], []]
-
-    l1, l2, l3 = [], [], []
-    for i in range(frames):
-        s = snac_ids[i*7:(i+1)*7]
-        l1.append((s[0] - CODE_TOKEN_OFFSET) % 4096)
-        l2.extend([
-            (s[1] - CODE_TOKEN_OFFSET) % 4096,  # L2a
-            (s[4] - CODE_TOKEN_OFFSET) % 4096,  # L2b
-        ])
-        l3.extend([
-            (s[2] - CODE_TOKEN_OFFSET) % 4096,  # L3a
-            (s[3] - CODE_TOKEN_OFFSET) % 4096,  # L3b
-            (s[5] - CODE_TOKEN_OFFSET) % 4096,  # L3c
-            (s[6] - CODE_TOKEN_OFFSET) % 4096,  # L3d
-        ])
+    frame_ids = snac_ids[:frames * SNAC_TOKENS_PER_FRAME].reshape(frames, SNAC_TOKENS_PER_FRAME)
+    codes = (frame_ids - CODE_TOKEN_OFFSET) & 0xFFF
+    l1 = codes[:, [0]].reshape(-1)
+    l2 = codes[:, [1, 4]].reshape(-1)  # L2a, L2b
+    l3 = codes[:, [2, 3, 5, 6]].reshape(-1)  # L3a, L3b, L3c, L3d
     return [l1, l2, l3]
 
 def synthesize_chunk_hf(
@@ -204,7 +308,8 @@ def synthesize_chunk_hf(
     top_p: float = 0.95,       # Increased to 0.95 for more diversity
     max_tokens: int = 2500,
     trim_samples: int | None = 512,
-) -> str:
+    return_array: bool = False,
+) -> str | np.ndarray:
     """
     Synthesize audio using HuggingFace Transformers model
 
@@ -216,24 +321,21 @@ def synthesize_chunk_hf(
         top_p: Top-p sampling (0.9 recommended)
         max_tokens: Maximum tokens to generate (2500 optimal with smart chunking)
         trim_samples: Number of initial samples to trim from decoded audio (None to disable)
+        return_array: Return the float32 samples (24 kHz mono) instead of
+                      writing them to a temporary WAV file
 
     Returns:
-        Path to generated WAV file
+        Path to generated WAV file, or the audio array if return_array is set
     """
     model, tokenizer, snac_model = _ensure_models(model_path)
 
-    # Clear GPU cache to prevent VRAM fragmentation
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
-        logger.debug("Cleared GPU cache before generation")
-
     # Build prompt
-    prompt = _build_prompt(voice_description, text)
-    logger.debug(f"Prompt: {prompt[:200]}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Prompt: {_build_prompt(voice_description, text)[:200]}...")
 
-    # Tokenize with special tokens
-    prompt_tokens = tokenizer.encode(prompt, add_special_tokens=False)
-    full_tokens = [SOH_ID, tokenizer.bos_token_id, *prompt_tokens, TEXT_EOT_ID, EOH_ID, SOA_ID, CODE_START_TOKEN_ID]
+    # Tokenize with special tokens; only the chunk text is new for each chunk
+    text_tokens = tokenizer.encode(f" {text.strip()}", add_special_tokens=False)
+    full_tokens = [*_encode_prompt_prefix(tokenizer, voice_description), *text_tokens, *_PROMPT_SUFFIX]
 
     logger.debug(f"Full prompt: {len(full_tokens)} tokens")
 
@@ -272,22 +374,33 @@ def synthesize_chunk_hf(
         use_cache = True
 
     # Generate - use CODE_END as EOS (as per official implementation)
-    with torch.inference_mode():
-        output = model.generate(
-            input_ids,
-            max_new_tokens=max_tokens,
-            min_new_tokens=28,  # At least 4 SNAC frames
-            temperature=temperature,
-            top_p=top_p,
-            do_sample=True,
-            repetition_penalty=1.2,  # Reduced from 1.3 (too high causes gibberish) but > 1.1 (loops)
-            pad_token_id=tokenizer.eos_token_id,
-            eos_token_id=CODE_END_TOKEN_ID,  # Stop at end of speech token (official way)
-            use_cache=use_cache,
-        )
+    def generate():
+        with torch.inference_mode():
+            return model.generate(
+                input_ids,
+                max_new_tokens=max_tokens,
+                min_new_tokens=28,  # At least 4 SNAC frames
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=True,
+                repetition_penalty=1.2,  # Reduced from 1.3 (too high causes gibberish) but > 1.1 (loops)
+                pad_token_id=tokenizer.eos_token_id,
+                eos_token_id=CODE_END_TOKEN_ID,  # Stop at end of speech token (official way)
+                logits_processor=_SNAC_LOGITS_PROCESSORS,  # Only sample audio tokens
+                use_cache=use_cache,
+            )
 
-    # Extract generated tokens
-    gen_ids = output[0][len(full_tokens):].tolist()
+    # The caching allocator keeps freed blocks for the next chunk; its cache
+    # is only emptied (a device sync) when an allocation actually fails
+    try:
+        output = generate()
+    except torch.cuda.OutOfMemoryError:
+        logger.warning("CUDA out of memory during generation; clearing GPU cache and retrying once")
+        torch.cuda.empty_cache()
+        output = generate()
+
+    # Extract generated tokens (as an int64 array, no per-token Python ints)
+    gen_ids = output[0, len(full_tokens):].cpu().numpy()
     logger.debug(f"Generated {len(gen_ids)} tokens")
     logger.debug(f"First 20 generated token IDs: {gen_ids[:20]}")
     logger.debug(f"Last 20 generated token IDs: {gen_ids[-20:]}")
@@ -307,18 +420,17 @@ def synthesize_chunk_hf(
     L1, L2, L3 = _unpack_snac_from_7(snac_ids)
     logger.debug(f"Unpacked SNAC: L1={len(L1)}, L2={len(L2)}, L3={len(L3)} codes")
 
-    if not L1 or not L2 or not L3:
+    if not (L1.size and L2.size and L3.size):
         logger.error(f"No audio frames produced. Gen_ids sample: {gen_ids[:20]}")
         raise RuntimeError("No audio frames produced (check description/prompt shape).")
 
     # Decode with SNAC
     device = next(snac_model.parameters()).device
     with torch.inference_mode():
-        codes_tensor = [
-            torch.tensor(L1, dtype=torch.long, device=device).unsqueeze(0),
-            torch.tensor(L2, dtype=torch.long, device=device).unsqueeze(0),
-            torch.tensor(L3, dtype=torch.long, device=device).unsqueeze(0),
-        ]
+        # The int64 arrays are wrapped without a per-element conversion and
+        # moved in a single host-to-device copy, then split into views
+        codes = torch.from_numpy(np.concatenate((L1, L2, L3))).to(device)
+        codes_tensor = [c.unsqueeze(0) for c in torch.split(codes, (len(L1), len(L2), len(L3)))]
         z_q = snac_model.quantizer.from_codes(codes_tensor)
         audio = snac_model.decoder(z_q).cpu().numpy()
 
@@ -335,11 +447,14 @@ def synthesize_chunk_hf(
     # Trim initial noise and apply fades for cleaner chunk joins
     audio = _apply_fade_and_trim(audio, trim_samples=trim_samples)
 
-    logger.debug(f"Final audio shape: {audio.shape}, duration: {len(audio)/24000:.2f}s")
+    logger.debug(f"Final audio shape: {audio.shape}, duration: {len(audio)/SAMPLE_RATE:.2f}s")
+
+    if return_array:
+        return np.ascontiguousarray(audio, dtype=np.float32)
 
     # Save to temp file
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-    sf.write(tmp.name, audio, 24000)
+    sf.write(tmp.name, audio, SAMPLE_RATE)
     tmp.flush()
     tmp.close()
 
@@ -10,6 +10,10 @@ import os
 import hashlib
 import logging
 from pathlib import Path
+
+import soundfile as sf
+
+from .maya1_constants import SAMPLE_RATE
 from .tts_maya1_hf import synthesize_chunk_hf
 from .voice_presets import PREVIEW_TEXT
 
@@ -127,18 +131,18 @@ def generate_voice_preview(
 
     try:
         # Synthesize preview using the same TTS engine as main pipeline
-        temp_wav = synthesize_chunk_hf(
+        audio = synthesize_chunk_hf(
             model_path=model_path,
             text=PREVIEW_TEXT,
             voice_description=voice_description,
             temperature=temperature,
             top_p=top_p,
             max_tokens=2500,  # Preview text is ~70 words, should fit comfortably
+            return_array=True,
         )
 
-        # Move temp file to cache location
-        import shutil
-        shutil.move(temp_wav, cache_path)
+        # Write straight to the cache location, no temporary WAV to move
+        sf.write(cache_path, audio, SAMPLE_RATE)
 
         logger.info(f"Voice preview generated and cached: {cache_path}")
         return str(cache_path)
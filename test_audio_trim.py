@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test silence trimming
+Checks trim_silence on mono and (frames, channels) audio (no model needed)
+"""
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from core.audio_advanced import trim_silence
+
+
+def _burst(shape, start, end):
+    audio = np.zeros(shape, dtype=np.float32)
+    audio[start:end] = 0.5
+    return audio
+
+
+def test_mono_trim():
+    """Leading and trailing silence is cut down to the padding"""
+    trimmed = trim_silence(_burst(24000, 12000, 13000), 24000)
+    assert trimmed.shape == (1000 + 2 * 2400,), trimmed.shape
+
+
+def test_stereo_trim():
+    """Stereo frames are trimmed as frames, not as flattened samples"""
+    trimmed = trim_silence(_burst((24000, 2), 12000, 13000), 24000)
+    assert trimmed.shape == (1000 + 2 * 2400, 2), trimmed.shape
+    assert np.all(trimmed[2400:3400] == 0.5)
+
+
+def test_stereo_one_channel_sound():
+    """A frame with sound in any channel is not silence"""
+    audio = np.zeros((24000, 2), dtype=np.float32)
+    audio[12000:13000, 1] = 0.5
+    trimmed = trim_silence(audio, 24000)
+    assert trimmed.shape == (1000 + 2 * 2400, 2), trimmed.shape
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"PASS {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
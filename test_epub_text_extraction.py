@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test EPUB chapter text extraction
+Checks that the streaming lxml path and the BeautifulSoup fallback extract
+the same paragraph text from chapter HTML (no model or EPUB file needed)
+"""
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.epub_extract import _parse_html_content
+
+
+def _chapter(body: str) -> bytes:
+    return f"<html><body>{body}</body></html>".encode("utf-8")
+
+
+def test_non_text_elements_are_dropped():
+    """script/style/template content never ends up in paragraph text"""
+    assert _parse_html_content(_chapter(
+        "<p>x<script>bad()</script>y</p><p>z<style>.a{}</style></p>"
+    )) == "xy\n\nz"
+    assert _parse_html_content(_chapter(
+        "<template><p>tpl</p></template><p>real</p>"
+    )) == "real"
+    assert _parse_html_content(_chapter(
+        "<p>a<template><p>in</p></template>b</p><p>c</p>"
+    )) == "ab\n\nc"
+    # Paragraphs only inside a template do not hide the chapter's loose text
+    assert _parse_html_content(_chapter(
+        "<template><p>tpl</p></template>loose"
+    )) == "loose"
+
+
+def test_undeclared_legacy_encoding():
+    """Non-UTF-8 chapters without a charset declaration decode correctly"""
+    content = "<html><body><p>café naïve</p></body></html>".encode("cp1252")
+    assert _parse_html_content(content) == "café naïve"
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"PASS {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())